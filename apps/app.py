@@ -1,9 +1,10 @@
 import streamlit as st
 import pandas as pd
-import os
-import tempfile
-from src.simple_parser import extract_text_from_pdf, extract_text_from_docx, extract_basic_fields
-from src.matcher import match_resume_to_jd
+from src.simple_parser import (UPLOAD_MAX_CHARS, UPLOAD_MAX_PDF_PAGES, extract_basic_fields, extract_document_text,
+                               safe_text_read)
+from src.feature_cache import content_hash
+from src.matcher import JobProfile, extract_skill_ids_from_resume, match_skill_ids_to_profile
+from src.ranking import TopK
 
 # Page configuration
 st.set_page_config(
@@ -41,6 +42,28 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_data(show_spinner=False)
+def parse_job_description(jd_text):
+    return JobProfile.from_text(jd_text)
+
+@st.cache_data(show_spinner=False, max_entries=5000)
+def parse_resume(file_hash, file_name, _content):
+    """Extract text, contact fields and skill IDs from an uploaded resume.
+
+    Cached by content hash (the bytes themselves are not hashed again), so
+    reruns triggered by widgets or JD edits skip extraction entirely. The
+    bytes are parsed in memory, up to the upload page and character
+    budgets; nothing is written to disk.
+    """
+    resume_text = extract_document_text(_content, file_name, max_pages=UPLOAD_MAX_PDF_PAGES,
+                                        max_chars=UPLOAD_MAX_CHARS)
+    
+    return {
+        'text': resume_text,
+        'fields': extract_basic_fields(resume_text) if resume_text else {},
+        'skill_ids': extract_skill_ids_from_resume(resume_text) if resume_text else frozenset()
+    }
+
 def main():
     # Header
     st.markdown('<div class="main-header"> Resume-JD Matching Tool</div>', unsafe_allow_html=True)
@@ -55,6 +78,10 @@ def main():
         4. **Download Rankings** - Export results as CSV
         """)
         
+        st.header("Ranking")
+        top_k = st.number_input("Candidates to rank", min_value=1, value=50, step=10)
+        min_score = st.slider("Minimum match score (%)", 0, 100, 0)
+        
         st.header("About")
         st.markdown("""
         This tool analyzes resumes against job descriptions using:
@@ -77,7 +104,8 @@ def main():
         else:
             jd_file = st.file_uploader("Upload JD File", type=['txt'])
             if jd_file:
-                jd_text = jd_file.read().decode("utf-8")
+                # getvalue() rather than read(): the same upload is handed back on every rerun
+                jd_text = safe_text_read(jd_file.getvalue())
                 st.text_area("JD Content:", jd_text, height=300)
     
     with col2:
@@ -91,34 +119,29 @@ def main():
     if jd_text and resume_files:
         st.subheader(" Matching Results")
         
-        results = []
+        # Bounded heap: only the best `top_k` rows are kept for the summary
+        ranking = TopK(int(top_k), min_score=min_score)
         progress_bar = st.progress(0)
         
+        # Parse the JD once for all uploaded resumes
+        profile = parse_job_description(jd_text)
+        
         for i, resume_file in enumerate(resume_files):
             # Update progress
             progress_bar.progress((i + 1) / len(resume_files))
             
-            # Extract text from resume based on file type
-            with tempfile.NamedTemporaryFile(delete=False, suffix=resume_file.name) as tmp_file:
-                tmp_file.write(resume_file.getvalue())
-                tmp_path = tmp_file.name
-            
             try:
-                if resume_file.name.endswith('.pdf'):
-                    resume_text = extract_text_from_pdf(tmp_path)
-                elif resume_file.name.endswith('.docx'):
-                    resume_text = extract_text_from_docx(tmp_path)
-                else:  # txt file
-                    resume_text = resume_file.read().decode("utf-8")
+                # Parsed once per distinct file; later reruns only re-score
+                content = resume_file.getvalue()
+                parsed = parse_resume(content_hash(content), resume_file.name, content)
                 
-                # Extract basic fields
-                basic_fields = extract_basic_fields(resume_text)
+                basic_fields = parsed['fields']
                 
                 # Match with JD
-                match_result = match_resume_to_jd(resume_text, jd_text)
+                match_result = match_skill_ids_to_profile(parsed['skill_ids'], profile)
                 
                 # Store results
-                results.append({
+                ranking.push(match_result['match_score'], resume_file.name, {
                     'Resume': resume_file.name,
                     'Candidate': basic_fields.get('email', 'Unknown').split('@')[0] if basic_fields.get('email') else resume_file.name,
                     'Email': basic_fields.get('email', ''),
@@ -158,16 +181,12 @@ def main():
             
             except Exception as e:
                 st.error(f"Error processing {resume_file.name}: {str(e)}")
-            finally:
-                # Clean up temp file
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
         
-        # Display summary table
+        # Display summary table, already sorted best first
+        results = ranking.results()
         if results:
             st.subheader(" Summary Rankings")
             df = pd.DataFrame(results)
-            df = df.sort_values('Match Score', ascending=False)
             
             # Display table
             st.dataframe(df, use_container_width=True)
@@ -2,7 +2,6 @@ import streamlit as st
 import pandas as pd
 import os
 import tempfile
-import chardet  # We'll install this if needed
 
 st.set_page_config(page_title="Resume Matcher", layout="wide")
 
@@ -13,6 +12,11 @@ jd_text = st.text_area("Paste Job Description here:", height=200)
 resume_files = st.file_uploader("Upload Resumes", type=['txt'], accept_multiple_files=True)
 
 if jd_text and resume_files:
+    from src.matcher import JobProfile, match_resume_to_profile
+    from src.simple_parser import safe_text_read
+    
+    # Parse the JD once for all uploaded resumes
+    profile = JobProfile.from_text(jd_text)
     results = []
     
     for resume_file in resume_files:
@@ -20,18 +24,11 @@ if jd_text and resume_files:
             # Super simple text reading
             content = resume_file.getvalue()
             
-            # Try to detect encoding
-            try:
-                text = content.decode('utf-8')
-            except:
-                try:
-                    text = content.decode('latin-1')
-                except:
-                    text = str(content)  # Last resort
+            # BOM, UTF-8, then cp1252 or a detected encoding
+            text = safe_text_read(content)
             
-            # Simple matching (import your functions)
-            from src.matcher import match_resume_to_jd
-            match_result = match_resume_to_jd(text, jd_text)
+            # Simple matching against the shared profile
+            match_result = match_resume_to_profile(text, profile)
             
             results.append({
                 'File': resume_file.name,
@@ -1,9 +1,17 @@
 import streamlit as st
 import pandas as pd
+import multiprocessing
 import os
-import tempfile
-from src.simple_parser import extract_text_from_pdf, extract_text_from_docx, extract_basic_fields, safe_text_read
-from src.matcher import match_resume_to_jd
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from src.feature_cache import content_hash
+from src.matcher import JobProfile, match_skill_ids_to_profile
+from src.pipeline import extract_upload
+from src.simple_parser import safe_text_read
+from src.ranking import TopK
+
+UPLOAD_WORKERS = os.cpu_count() or 1
 
 # Page configuration
 st.set_page_config(
@@ -41,21 +49,45 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def safe_decode(file_content, filename):
-    """Safely decode file content with multiple encoding fallbacks"""
-    encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-    
-    for encoding in encodings:
-        try:
-            return file_content.decode(encoding)
-        except UnicodeDecodeError:
-            continue
-    
-    # If all encodings fail, use replace strategy
-    try:
-        return file_content.decode('utf-8', errors='replace')
-    except:
-        return file_content.decode('latin-1', errors='replace')
+@st.cache_data(show_spinner=False)
+def parse_job_description(jd_text):
+    return JobProfile.from_text(jd_text)
+
+@st.cache_resource
+def get_worker_pool():
+    """Process pool for extraction, shared by all sessions.
+
+    Parsing is CPU-bound, so it runs in processes rather than threads.
+    Workers are spawned, not forked, because the server is multi-threaded.
+    """
+    return ProcessPoolExecutor(max_workers=UPLOAD_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+
+@st.cache_data(show_spinner=False, max_entries=5000)
+def parse_resume(file_hash, file_name, _content):
+    """Extract text, contact fields and skill IDs from an uploaded resume (None if unreadable).
+
+    Cached by content hash (the bytes themselves are not hashed again), so
+    reruns triggered by widgets or JD edits skip extraction entirely. The
+    bytes are parsed in memory on the worker pool; nothing is written to disk.
+    """
+    return get_worker_pool().submit(extract_upload, file_name, _content).result()
+
+def iter_parsed_uploads(resume_files):
+    """Yield (upload, future) pairs in completion order.
+
+    Cached uploads finish immediately; the rest are parsed concurrently.
+    The threads only wait on the process pool, and carry the script context
+    so the Streamlit cache works inside them.
+    """
+    ctx = get_script_run_ctx()
+    init = lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, initializer=init) as executor:
+        futures = {}
+        for resume_file in resume_files:
+            content = resume_file.getvalue()
+            futures[executor.submit(parse_resume, content_hash(content), resume_file.name, content)] = resume_file
+        for future in as_completed(futures):
+            yield futures[future], future
 
 def main():
     # Header
@@ -71,6 +103,10 @@ def main():
         4. **Download Rankings** - Export results as CSV
         """)
         
+        st.header("Ranking")
+        top_k = st.number_input("Candidates to rank", min_value=1, value=50, step=10)
+        min_score = st.slider("Minimum match score (%)", 0, 100, 0)
+        
         st.header("About")
         st.markdown("""
         This tool analyzes resumes against job descriptions using:
@@ -93,7 +129,7 @@ def main():
         else:
             jd_file = st.file_uploader("Upload JD File", type=['txt'])
             if jd_file:
-                jd_text = safe_decode(jd_file.read(), jd_file.name)
+                jd_text = safe_text_read(jd_file.getvalue())
                 st.text_area("JD Content:", jd_text, height=300)
     
     with col2:
@@ -107,38 +143,40 @@ def main():
     if jd_text and resume_files:
         st.subheader(" Matching Results")
         
-        results = []
+        # Bounded heap: only the best `top_k` rows are kept for the summary
+        ranking = TopK(int(top_k), min_score=min_score)
         progress_bar = st.progress(0)
+        status = st.empty()
+        
+        # Parse the JD once for all uploaded resumes
+        profile = parse_job_description(jd_text)
         
-        for i, resume_file in enumerate(resume_files):
+        # Filled in as results arrive, already sorted best first
+        st.subheader(" Summary Rankings")
+        summary_table = st.empty()
+        completed = failed = 0
+        
+        # Results render as each upload finishes, not in upload order
+        for i, (resume_file, future) in enumerate(iter_parsed_uploads(resume_files)):
             # Update progress
             progress_bar.progress((i + 1) / len(resume_files))
             
-            # Extract text from resume based on file type
-            with tempfile.NamedTemporaryFile(delete=False, suffix=resume_file.name) as tmp_file:
-                tmp_file.write(resume_file.getvalue())
-                tmp_path = tmp_file.name
-            
             try:
-                if resume_file.name.endswith('.pdf'):
-                    resume_text = extract_text_from_pdf(tmp_path)
-                elif resume_file.name.endswith('.docx'):
-                    resume_text = extract_text_from_docx(tmp_path)
-                else:  # txt file
-                    resume_text = safe_text_read(tmp_path)  # Use our new safe function
+                # Parsed once per distinct file; later reruns only re-score
+                parsed = future.result()
                 
-                if not resume_text or len(resume_text.strip()) < 10:
+                if parsed is None or len(parsed['text'].strip()) < 10:
                     st.warning(f"Skipped {resume_file.name}: No readable text content")
+                    failed += 1
                     continue
                 
-                # Extract basic fields
-                basic_fields = extract_basic_fields(resume_text)
+                basic_fields = parsed['fields']
                 
                 # Match with JD
-                match_result = match_resume_to_jd(resume_text, jd_text)
+                match_result = match_skill_ids_to_profile(parsed['skill_ids'], profile)
                 
                 # Store results
-                results.append({
+                ranking.push(match_result['match_score'], resume_file.name, {
                     'Resume': resume_file.name,
                     'Candidate': basic_fields.get('email', 'Unknown').split('@')[0] if basic_fields.get('email') else resume_file.name,
                     'Email': basic_fields.get('email', ''),
@@ -175,22 +213,22 @@ def main():
                         st.write("**Resume Skills:**", ", ".join(match_result['resume_skills'][:10]))
                     with col2:
                         st.write("**Missing Skills:**", ", ".join(match_result['missing_skills'][:10]))
+                completed += 1
             
             except Exception as e:
                 st.error(f"Error processing {resume_file.name}: {str(e)}")
+                failed += 1
             finally:
-                # Clean up temp file
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
+                # Live counts and summary after every upload
+                pending = len(resume_files) - completed - failed
+                status.markdown(f"**{completed}** completed, **{failed}** failed, **{pending}** pending")
+                results = ranking.results()
+                if results:
+                    summary_table.dataframe(pd.DataFrame(results), use_container_width=True)
         
-        # Display summary table
+        results = ranking.results()
         if results:
-            st.subheader(" Summary Rankings")
             df = pd.DataFrame(results)
-            df = df.sort_values('Match Score', ascending=False)
-            
-            # Display table
-            st.dataframe(df, use_container_width=True)
             
             # Download button
             csv = df.to_csv(index=False)
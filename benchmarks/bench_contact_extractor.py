@@ -0,0 +1,116 @@
+"""Contact fields on adversarial inputs: the fused bounded extractor vs the previous per-field regexes.
+
+The previous code ran the email and phone regexes in extract_basic_fields,
+ran both again in advanced_parser, and looped over the lines for education
+keywords. Their unbounded repeats rescan to the end of a run from every
+possible start, so some inputs (dotted tokens with no "@", an "@" before a
+long dotted run) take time quadratic in their length. Each input is timed
+at doubling sizes: a linear scan roughly doubles per row, a quadratic one
+roughly quadruples. A typical synthetic resume is included for reference.
+Before timing, the first email, first phone and education lines of a set
+of ordinary resume lines (contact lines, year ranges, keywords inside words
+and URLs) are checked against the previous code, and dates are checked not
+to be read as phones.
+
+Run from the repository root:
+    python benchmarks/bench_contact_extractor.py --sizes 2000,4000,8000,16000
+"""
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from contact_extractor import extract_contacts
+from corpus import resume_text
+
+OLD_EMAIL = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+OLD_PHONE = re.compile(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]')
+OLD_EDUCATION_KEYWORDS = ['bachelor', 'master', 'phd', 'degree', 'university', 'college', 'institute']
+
+ADVERSARIAL = {
+    'digit/space table': lambda n: ('1 2 ' * n)[:n],
+    'dotted, no "@"': lambda n: ('a.' * n)[:n],
+    '"@" then dots': lambda n: 'x@' + ('a.' * n)[:n] + '1',
+    'open parens': lambda n: ('(1' * n)[:n] + 'x',
+    'typical resume': lambda n: resume_text(0, n),
+}
+
+# Lines on which the fused extractor must give the same first email and phone
+EQUIVALENCE_CASES = [
+    'Jane Doe | jane.doe@example.com | +1 (555) 123-4567',
+    'Phone: +91-9876543210, Email: raj.k@mail.co.in',
+    'Contact 555.123.4567',
+    'XYZ University, 2020-2024',
+    'Education 2016-2020 BSc',
+    'GPA 3.8, 2019 2023',
+    'Software Engineer, Acme (2018-2022)',
+    'BSc Computer Science 2012/2016',
+    'Senior Developer 2020 2024 remote',
+    'Headmaster, Springfield High',
+    'Thesis: github.com/jdoe/master-thesis',
+    'Postgraduate DEGREE in Physics\r',
+]
+
+# Lines the previous phone regex read as a phone, which now have none
+NOT_PHONES = [
+    'GPA 4.0 2019.06.01',
+    'Ref 12 01.02.2021',
+    'Release 1.2 2019-06-01',
+]
+
+
+def previous_fields(text):
+    """Basic then advanced field extraction as it was: two regex passes each, plus the education loop"""
+    for _ in range(2):
+        email = OLD_EMAIL.findall(text)
+        phone = OLD_PHONE.findall(text)
+    education = [line.strip() for line in text.split('\n')
+                 if any(keyword in line.lower() for keyword in OLD_EDUCATION_KEYWORDS)]
+    return email, phone, education
+
+
+def check_equivalence():
+    for text in EQUIVALENCE_CASES:
+        email, phone, education = previous_fields(text)
+        contacts = extract_contacts(text)
+        expected = (email[0] if email else '', phone[0] if phone else '', education)
+        got = (contacts.email, contacts.phone, contacts.education)
+        if got != expected:
+            raise SystemExit(f"{text!r}: expected {expected}, got {got}")
+    for text in NOT_PHONES:
+        if extract_contacts(text).phones:
+            raise SystemExit(f"{text!r}: read {extract_contacts(text).phone!r} as a phone")
+    print(f"{len(EQUIVALENCE_CASES)} equivalence cases agree with the previous code, "
+          f"{len(NOT_PHONES)} dates are not phones")
+
+
+def median_ms(function, text, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(text)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='2000,4000,8000,16000', help="comma-separated input sizes in characters")
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    check_equivalence()
+    print(f"{'input':>18} {'size':>7} {'previous ms':>12} {'fused ms':>9}")
+    for name, build in ADVERSARIAL.items():
+        for size in [int(s) for s in args.sizes.split(',')]:
+            text = build(size)
+            print(f"{name:>18} {size:>7} {median_ms(previous_fields, text, args.repeats):>12.2f} "
+                  f"{median_ms(extract_contacts, text, args.repeats):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
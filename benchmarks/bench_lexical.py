@@ -0,0 +1,70 @@
+"""BM25 / TF-IDF scoring: one sparse product per JD vs scoring each pair separately.
+
+Builds a LexicalIndex over synthetic resumes drawn from a Zipf-like
+vocabulary, then times whole-corpus JD queries against fitting and
+scoring every resume individually the way match_resume_to_jd does.
+
+Run from the repository root:
+    python benchmarks/bench_lexical.py --resumes 100000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+
+from lexical import LexicalIndex
+
+
+def zipf_texts(count, vocabulary, length, rng):
+    """Documents whose word frequencies fall off like natural text"""
+    weights = 1.0 / np.arange(1, vocabulary + 1)
+    weights /= weights.sum()
+    lengths = rng.integers(length // 2, length * 2, size=count)
+    draws = rng.choice(vocabulary, size=int(lengths.sum()), p=weights)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    return [' '.join(f"t{w}" for w in draws[offsets[i]:offsets[i + 1]]) for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=100000)
+    parser.add_argument('--vocabulary', type=int, default=50000)
+    parser.add_argument('--length', type=int, default=300, help="median words per resume")
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--pairwise-sample', type=int, default=500,
+                        help="resumes scored one at a time to estimate the per-pair cost")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(3)
+    resumes = zipf_texts(args.resumes, args.vocabulary, args.length, rng)
+    jds = zipf_texts(args.queries, args.vocabulary, 120, rng)
+
+    for method in ('bm25', 'tfidf'):
+        start = time.perf_counter()
+        index = LexicalIndex(resumes, method=method)
+        build_s = time.perf_counter() - start
+
+        latencies = []
+        for jd in jds:
+            start = time.perf_counter()
+            index.scores(jd)
+            latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for resume in resumes[:args.pairwise_sample]:
+            LexicalIndex([resume], method=method).scores(jds[0])
+        pairwise_s = (time.perf_counter() - start) / args.pairwise_sample * args.resumes
+
+        print(f"{method}: build {build_s:.1f}s for {args.resumes} resumes, {len(index.vocabulary)} terms, "
+              f"{index.matrix.nnz} weights")
+        print(f"  corpus query: median {statistics.median(latencies) * 1000:.1f} ms per JD")
+        print(f"  pair by pair: ~{pairwise_s:.1f}s per JD (extrapolated from {args.pairwise_sample})")
+
+
+if __name__ == "__main__":
+    main()
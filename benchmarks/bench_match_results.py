@@ -0,0 +1,54 @@
+"""Cost of holding a resume x JD cross-product of match results: compact MatchResult vs full dicts.
+
+Scores every synthetic resume against every JD with match_resumes_to_jd,
+keeps all the results (as a batch run does before sorting) and reports
+time and traced memory. The dict figures come from calling to_dict() on
+each result, which builds the same skill lists and reasons the matcher
+used to build eagerly.
+
+Run from the repository root:
+    python benchmarks/bench_match_results.py --resumes 5000 --jds 20
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from corpus import jd_text, resume_text
+from matcher import JobProfile, extract_skill_ids_from_resume, match_resumes_to_jd
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return results, elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=5000)
+    parser.add_argument('--jds', type=int, default=20)
+    args = parser.parse_args()
+
+    skill_sets = [extract_skill_ids_from_resume(resume_text(i)) for i in range(args.resumes)]
+    profiles = [JobProfile.from_text(jd_text(j), name=f"jd_{j}") for j in range(args.jds)]
+    pairs = args.resumes * args.jds
+
+    compact, compact_s, compact_bytes = measure(
+        lambda: [result for profile in profiles for result in match_resumes_to_jd(skill_sets, profile)])
+    _, dict_s, dict_bytes = measure(lambda: [result.to_dict() for result in compact])
+
+    print(f"{pairs} results ({args.resumes} resumes x {args.jds} JDs)")
+    print(f"  MatchResult: {compact_s:.2f}s, {compact_bytes / 1e6:.1f} MB ({compact_bytes / pairs:.0f} B per pair)")
+    print(f"  full dicts:  +{dict_s:.2f}s, {dict_bytes / 1e6:.1f} MB ({dict_bytes / pairs:.0f} B per pair)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Import-time and first-call latency of advanced_parser.
+
+Each measurement runs in a fresh interpreter so nothing is already
+imported or loaded.
+
+Run from the repository root:
+    python benchmarks/bench_model_loading.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import advanced_parser
+imported = time.perf_counter()
+advanced_parser.extract_advanced_fields("John Doe is a developer at Google in London")
+first = time.perf_counter()
+advanced_parser.extract_advanced_fields("Jane Roe is a developer at Microsoft in Paris")
+second = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_call_ms": (first - imported) * 1000,
+    "second_call_ms": (second - first) * 1000,
+}))
+"""
+
+
+def run_probe():
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=SRC_DIR, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    samples = [run_probe() for _ in range(args.runs)]
+    for key in ('import_ms', 'first_call_ms', 'second_call_ms'):
+        values = [sample[key] for sample in samples]
+        print(f"{key:>15}: median {statistics.median(values):8.1f}  min {min(values):8.1f}  max {max(values):8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Throughput of the ingest stage as the worker count rises.
+
+Writes a synthetic corpus of DOCX resumes to a temporary directory and
+ingests it with 1, 2, 4, ... workers, checking that every run produces
+the same records as the sequential path.
+
+Run from the repository root:
+    python benchmarks/bench_parallel_ingest.py --docs 400
+    python benchmarks/bench_parallel_ingest.py --advanced   # spaCy NER fields
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import docx
+
+from main import extract_resume_text
+from pipeline import ingest_resumes
+from simple_parser import extract_basic_fields
+from taxonomy import get_taxonomy
+
+WORDS = ("developed designed maintained deployed services pipelines team product customers "
+         "platform scalable reliable data analysis reporting dashboards migrated improved").split()
+
+
+def write_corpus(directory, count, paragraphs, seed=7):
+    """Write `count` DOCX resumes and return their file names"""
+    rng = random.Random(seed)
+    skills = get_taxonomy().names
+    names = []
+    for i in range(count):
+        document = docx.Document()
+        document.add_paragraph(f"Candidate {i}")
+        document.add_paragraph(f"candidate{i}@example.com  +1 555 010 {i:04d}")
+        document.add_paragraph("Skills: " + ", ".join(rng.sample(skills, 8)))
+        for _ in range(paragraphs):
+            document.add_paragraph(" ".join(rng.choice(WORDS) for _ in range(40)))
+        name = f"resume_{i:05d}.docx"
+        document.save(os.path.join(directory, name))
+        names.append(name)
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--docs', type=int, default=200)
+    parser.add_argument('--paragraphs', type=int, default=30)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    parser.add_argument('--advanced', action='store_true', help="use spaCy NER field extraction")
+    args = parser.parse_args()
+
+    extract_fields = extract_basic_fields
+    if args.advanced:
+        from advanced_parser import extract_advanced_fields
+        extract_fields = extract_advanced_fields
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= args.max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != args.max_workers:
+        worker_counts.append(args.max_workers)
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = write_corpus(directory, args.docs, args.paragraphs)
+        print(f"{args.docs} DOCX resumes, {os.cpu_count()} CPUs")
+        print(f"{'workers':>8} {'seconds':>9} {'docs/s':>9} {'speedup':>8}")
+
+        baseline = None
+        for workers in worker_counts:
+            start = time.perf_counter()
+            records = ingest_resumes(directory, files, extract_resume_text, extract_fields, workers=workers)
+            elapsed = time.perf_counter() - start
+
+            if baseline is None:
+                baseline = (records, elapsed)
+            assert records == baseline[0], f"records differ with {workers} workers"
+            print(f"{workers:>8} {elapsed:>9.2f} {args.docs / elapsed:>9.1f} {baseline[1] / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Candidate retrieval from the inverted skill index vs scoring every resume.
+
+Builds an index over synthetic resumes whose skills follow a Zipf-like
+distribution over a large vocabulary, then times JD queries against a
+brute-force scan of all resumes.
+
+Run from the repository root:
+    python benchmarks/bench_skill_index.py --resumes 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+
+from matcher import JobProfile
+from skill_index import SkillIndex
+from skill_matrix import score_all_pairs
+
+
+def zipf_skill_sets(count, n_skills, per_doc, rng):
+    """Skill sets where low IDs are common and high IDs are rare"""
+    weights = 1.0 / np.arange(1, n_skills + 1)
+    weights /= weights.sum()
+    draws = rng.choice(n_skills, size=(count, per_doc), p=weights)
+    return [frozenset(row) for row in draws.tolist()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=1000000)
+    parser.add_argument('--skills', type=int, default=5000)
+    parser.add_argument('--per-resume', type=int, default=15)
+    parser.add_argument('--queries', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(5)
+    resumes = zipf_skill_sets(args.resumes, args.skills, args.per_resume, rng)
+    keys = [f"resume_{i:07d}.pdf" for i in range(args.resumes)]
+
+    start = time.perf_counter()
+    index = SkillIndex(args.skills)
+    index.add_many(keys, resumes)
+    index.compact()
+    print(f"build: {time.perf_counter() - start:.1f}s for {args.resumes} resumes, {args.skills} skills")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'index.npz')
+        start = time.perf_counter()
+        index.save(path)
+        save_s = time.perf_counter() - start
+        start = time.perf_counter()
+        index = SkillIndex.load(path)
+        print(f"save: {save_s:.1f}s, load: {time.perf_counter() - start:.1f}s, "
+              f"size: {os.path.getsize(path) / 1e6:.0f} MB")
+
+    start = time.perf_counter()
+    for i in range(1000):
+        index.remove(keys[i])
+        index.add(keys[i], resumes[i])
+    print(f"incremental update: {(time.perf_counter() - start) / 1000 * 1e6:.1f} us per resume")
+
+    # Brute force over the whole corpus for comparison (one sparse product)
+    py_rng = random.Random(9)
+    profiles = []
+    for q in range(args.queries):
+        ids = sorted(set(py_rng.randrange(args.skills) for _ in range(py_rng.randint(3, 12))))
+        profiles.append(JobProfile(name=f"jd_{q}", skill_ids=tuple(ids), skills=()))
+
+    start = time.perf_counter()
+    brute = score_all_pairs(resumes, profiles, n_skills=args.skills)
+    brute_s = (time.perf_counter() - start) / len(profiles)
+
+    latencies = []
+    candidate_counts = []
+    for j, profile in enumerate(profiles):
+        start = time.perf_counter()
+        results = index.query(profile)
+        latencies.append(time.perf_counter() - start)
+        candidate_counts.append(len(results))
+        assert len(results) == int((brute.matched[:, j] > 0).sum())
+
+    print(f"query: median {statistics.median(latencies) * 1000:.1f} ms, "
+          f"max {max(latencies) * 1000:.1f} ms, "
+          f"median candidates {statistics.median(candidate_counts):.0f} of {args.resumes}")
+    print(f"brute-force all-resume scoring: {brute_s * 1000:.1f} ms per JD (amortised sparse product)")
+
+
+if __name__ == "__main__":
+    main()
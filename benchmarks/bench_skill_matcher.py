@@ -0,0 +1,85 @@
+"""Compare the per-skill regex loop with the compiled SkillMatcher.
+
+Run from the repository root:
+    python benchmarks/bench_skill_matcher.py
+"""
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from taxonomy import get_taxonomy
+from skill_matcher import SkillMatcher
+
+
+def per_skill_loop(skills, text):
+    """The original extract_skills_from_resume loop"""
+    found = []
+    for skill in skills:
+        if re.search(r'\b' + re.escape(skill) + r'\b', text):
+            found.append(skill)
+    return found
+
+
+def synthetic_vocabulary(size, rng):
+    """Real skills padded with random one- and two-word terms"""
+    vocab = list(get_taxonomy().names)
+    seen = set(vocab)
+    while len(vocab) < size:
+        words = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 9)))
+                 for _ in range(rng.randint(1, 2))]
+        term = ' '.join(words)
+        if term not in seen:
+            seen.add(term)
+            vocab.append(term)
+    return vocab
+
+
+def synthetic_resume(vocab, rng, words=600):
+    """Filler text with a sprinkling of vocabulary terms"""
+    parts = []
+    for _ in range(words):
+        if rng.random() < 0.05:
+            parts.append(rng.choice(vocab))
+        else:
+            parts.append(''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 10))))
+        if rng.random() < 0.1:
+            parts.append(rng.choice([',', '.', '\n', '-', '/']))
+    return ' '.join(parts)
+
+
+def time_call(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'vocab':>7} {'compile ms':>11} {'loop ms/doc':>12} {'compiled ms/doc':>16} {'speedup':>8}")
+
+    for size in (45, 250, 1000, 2500, 5000):
+        vocab = synthetic_vocabulary(size, rng)
+        docs = [synthetic_resume(vocab, rng) for _ in range(20)]
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(vocab)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        for doc in docs:
+            assert matcher.find(doc) == per_skill_loop(vocab, doc), "result mismatch"
+
+        repeat = max(1, 2000 // size)
+        loop_s = time_call(lambda: [per_skill_loop(vocab, d) for d in docs], repeat) / len(docs)
+        fast_s = time_call(lambda: [matcher.find(d) for d in docs], repeat) / len(docs)
+
+        print(f"{size:>7} {compile_ms:>11.1f} {loop_s * 1000:>12.3f} {fast_s * 1000:>16.3f} {loop_s / fast_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
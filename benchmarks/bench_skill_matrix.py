@@ -0,0 +1,90 @@
+"""All-pairs scoring: per-pair Python loop vs one sparse matrix product.
+
+Also times the pipeline's top-K scoring stage (rank_records: per-JD
+columns of the skill matrix fed to a bounded heap) against scoring each
+pair with the Python matcher, and checks that both keep the same resumes
+with the same scores.
+
+Run from the repository root:
+    python benchmarks/bench_skill_matrix.py --resumes 100000 --jds 50
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from matcher import JobProfile, calculate_match_score, match_resumes_to_jd, score_skill_ids
+from pipeline import rank_records
+from ranking import top_k_per_profile
+from skill_matrix import score_all_pairs
+from taxonomy import get_taxonomy
+
+
+def random_skill_sets(count, n_skills, rng, low=3, high=25):
+    return [frozenset(rng.sample(range(n_skills), rng.randint(low, high))) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=100000)
+    parser.add_argument('--jds', type=int, default=50)
+    parser.add_argument('--loop-sample', type=int, default=5000,
+                        help="resumes scored with the Python loop (extrapolated)")
+    parser.add_argument('--top-k', type=int, default=10, help="K for the ranking stage comparison")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    taxonomy = get_taxonomy()
+    n_skills = len(taxonomy)
+    resumes = random_skill_sets(args.resumes, n_skills, rng)
+    profiles = [
+        JobProfile(name=f"jd_{j}", skill_ids=tuple(sorted(ids)), skills=tuple(taxonomy.to_names(ids)))
+        for j, ids in enumerate(random_skill_sets(args.jds, n_skills, rng, 0, 15))
+    ]
+
+    start = time.perf_counter()
+    pair_scores = score_all_pairs(resumes, profiles)
+    scores = pair_scores.scores
+    matrix_s = time.perf_counter() - start
+
+    sample = resumes[:args.loop_sample]
+    start = time.perf_counter()
+    loop_scores = [[calculate_match_score(ids, profile.skill_ids)[0] for profile in profiles] for ids in sample]
+    loop_s = (time.perf_counter() - start) * len(resumes) / len(sample)
+
+    for r, row in enumerate(loop_scores):
+        for j, expected in enumerate(row):
+            assert scores[r, j] == expected, (r, j, scores[r, j], expected)
+            assert pair_scores.score(r, j) == round(expected, 2)
+
+    pairs = args.resumes * args.jds
+    print(f"{args.resumes} resumes x {args.jds} JDs = {pairs} pairs, {n_skills} skills")
+    print(f"python loop (extrapolated): {loop_s:8.2f}s")
+    print(f"sparse matrix product:      {matrix_s:8.2f}s  ({loop_s / matrix_s:.0f}x)")
+
+    records = [{'resume_file': f"resume_{i:07d}.pdf", 'skill_ids': ids} for i, ids in enumerate(resumes)]
+    start = time.perf_counter()
+    ranked = [(record['resume_file'], profile.name, result.match_score)
+              for record, profile, result in rank_records(records, profiles, k=args.top_k)]
+    rank_s = time.perf_counter() - start
+
+    # Per-pair Python scoring into the same heap
+    start = time.perf_counter()
+    previous = []
+    score_fn = lambda record, profile: score_skill_ids(record['skill_ids'], profile)
+    for profile, kept in top_k_per_profile(records, profiles, score_fn, args.top_k):
+        results = match_resumes_to_jd([record['skill_ids'] for record, _ in kept], profile)
+        previous.extend((record['resume_file'], profile.name, result.match_score)
+                        for (record, _), result in zip(kept, results))
+    previous_s = time.perf_counter() - start
+    assert ranked == previous
+
+    print(f"top-{args.top_k} ranking, per-pair scores:  {previous_s:8.2f}s")
+    print(f"top-{args.top_k} ranking, matrix columns:   {rank_s:8.2f}s  ({previous_s / rank_s:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
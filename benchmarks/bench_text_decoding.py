@@ -0,0 +1,63 @@
+"""Text file decoding: one read with text_decoding vs reopening the file once per candidate encoding.
+
+Writes UTF-8 and cp1252 copies of a synthetic resume at several sizes and
+times safe_text_read against the old approach, which opened and read the
+whole file again for every encoding it tried.
+
+Run from the repository root:
+    python benchmarks/bench_text_decoding.py --repeats 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from corpus import resume_text
+from simple_parser import safe_text_read
+
+
+def reopen_per_encoding(file_path):
+    """The previous safe_text_read"""
+    for encoding in ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1', 'windows-1252']:
+        try:
+            with open(file_path, 'r', encoding=encoding) as f:
+                return f.read()
+        except UnicodeDecodeError:
+            continue
+
+
+def median_ms(function, path, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(path)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10000,1000000,20000000', help="comma-separated sizes in characters")
+    parser.add_argument('--repeats', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'size':>10} {'encoding':>9} {'reopen ms':>10} {'single read ms':>15}")
+        for size in [int(s) for s in args.sizes.split(',')]:
+            # A curly apostrophe makes the text invalid UTF-8 once encoded as cp1252
+            text = (resume_text(0, size) + "\nCandidate’s résumé\n")
+            for encoding in ('utf-8', 'cp1252'):
+                path = os.path.join(directory, f"resume_{size}_{encoding}.txt")
+                with open(path, 'w', encoding=encoding) as f:
+                    f.write(text)
+                assert safe_text_read(path) == text
+                print(f"{size:>10} {encoding:>9} {median_ms(reopen_per_encoding, path, args.repeats):>10.2f} "
+                      f"{median_ms(safe_text_read, path, args.repeats):>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
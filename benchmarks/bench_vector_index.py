@@ -0,0 +1,126 @@
+"""Recall vs latency of the quantized IVF vector index against exact brute-force search.
+
+Generates clustered unit vectors (resume embeddings tend to cluster by
+role), builds int8 and fp16 indexes, and for a range of n_probe values
+reports recall@k against exact cosine top-k and the median query time.
+It then checks that repeated updates of one resume keep the row count
+and times an incremental update (a small share of new vectors added
+to the trained lists and saved) against retraining the whole index.
+
+Run from the repository root:
+    python benchmarks/bench_vector_index.py --vectors 1000000 --dim 384
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+
+from vector_index import VectorIndex, update_vector_index
+
+
+def clustered_vectors(count, dim, clusters, rng, spread=0.6):
+    """Unit vectors scattered around `clusters` random directions"""
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = np.empty((count, dim), dtype=np.float32)
+    for start in range(0, count, 100000):
+        end = min(count, start + 100000)
+        owners = rng.integers(clusters, size=end - start)
+        noise = rng.standard_normal((end - start, dim)).astype(np.float32) * spread
+        vectors[start:end] = centers[owners] + noise
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def exact_top_k(vectors, query, k):
+    scores = vectors @ query
+    top = np.argpartition(-scores, k - 1)[:k]
+    return set(top.tolist())
+
+
+def check_repeated_updates(keys, vectors):
+    """Replace the same trained row over several saved updates; the live count must not drift"""
+    with tempfile.TemporaryDirectory() as directory:
+        VectorIndex.build(keys, vectors).save(directory)
+        for _ in range(3):
+            index = update_vector_index(VectorIndex.load(directory), keys[:1], vectors[:1])
+            index.save(directory)
+            if len(index) != len(keys) or index.drift != 2 / len(keys):
+                raise SystemExit(f"repeated update: {len(index)} rows, drift {index.drift}; "
+                                 f"expected {len(keys)} rows, drift {2 / len(keys)}")
+    print(f"repeated updates keep {len(keys)} rows")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vectors', type=int, default=200000)
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--clusters', type=int, default=200)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--probes', default='1,2,4,8,16,32,64')
+    parser.add_argument('--update-share', type=float, default=0.01,
+                        help="new vectors in the incremental update, as a share of --vectors")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(11)
+    vectors = clustered_vectors(args.vectors, args.dim, args.clusters, rng)
+    queries = clustered_vectors(args.queries, args.dim, args.clusters, np.random.default_rng(11))
+    keys = [str(i) for i in range(args.vectors)]
+
+    start = time.perf_counter()
+    truth = [exact_top_k(vectors, query, args.k) for query in queries]
+    brute_ms = (time.perf_counter() - start) / args.queries * 1000
+    print(f"exact brute force: {brute_ms:.1f} ms per query over {args.vectors} x {args.dim} float32")
+
+    for precision in ('int8', 'fp16'):
+        start = time.perf_counter()
+        index = VectorIndex.build(keys, vectors, precision=precision)
+        build_s = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as directory:
+            index.save(directory)
+            code_mb = os.path.getsize(os.path.join(directory, 'codes.npy')) / 1e6
+            index = VectorIndex.load(directory)
+            print(f"\n{precision}: build {build_s:.1f}s, {index.n_lists} lists, codes {code_mb:.0f} MB "
+                  f"(float32 would be {vectors.nbytes / 1e6:.0f} MB)")
+            print(f"{'n_probe':>8} {'recall@' + str(args.k):>10} {'median ms':>10} {'p95 ms':>8}")
+
+            for n_probe in [int(p) for p in args.probes.split(',')]:
+                latencies = []
+                hits = 0
+                for query, expected in zip(queries, truth):
+                    start = time.perf_counter()
+                    results = index.search(query, k=args.k, n_probe=n_probe)
+                    latencies.append(time.perf_counter() - start)
+                    hits += len(expected & {int(key) for key, _ in results})
+                latencies.sort()
+                p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+                print(f"{n_probe:>8} {hits / (args.k * args.queries):>10.3f} "
+                      f"{statistics.median(latencies) * 1000:>10.2f} {p95 * 1000:>8.2f}")
+            del index
+
+    check_repeated_updates(keys[:1000], vectors[:1000])
+
+    new_count = max(1, int(args.vectors * args.update_share))
+    new_vectors = clustered_vectors(new_count, args.dim, args.clusters, np.random.default_rng(12))
+    new_keys = [f"new{i}" for i in range(new_count)]
+    with tempfile.TemporaryDirectory() as directory:
+        VectorIndex.build(keys, vectors).save(directory)
+        for retrain in (False, True):
+            start = time.perf_counter()
+            index = update_vector_index(VectorIndex.load(directory), new_keys, new_vectors, retrain=retrain)
+            index.save(directory)
+            label = 'retrain' if retrain else 'add to lists'
+            print(f"\nupdate with {new_count} new vectors, {label}: {time.perf_counter() - start:.2f}s "
+                  f"(drift {index.drift:.3f})")
+            del index
+
+
+if __name__ == "__main__":
+    main()
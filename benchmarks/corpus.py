@@ -0,0 +1,227 @@
+"""Deterministic synthetic resume / JD corpus for benchmarks.
+
+Every document is a pure function of (seed, index, size), so any slice of
+a corpus can be regenerated exactly, and results from different commits
+are measured on identical input. Resumes come as txt, DOCX or PDF, from
+about 1 KB to multi-page, and are laid out like the repository's data
+directory (resumes/ and jds/).
+
+Run from the repository root:
+    python benchmarks/corpus.py /tmp/corpus --resumes 10000 --jds 20 --formats txt,docx,pdf --size 10kb
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import textwrap
+from functools import lru_cache
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from taxonomy import get_taxonomy
+
+# Target characters of resume text per size preset
+SIZES = {
+    '1kb': 1000,
+    '10kb': 10000,
+    'multipage': 40000,
+}
+FORMATS = ('txt', 'docx', 'pdf')
+
+FIRST_NAMES = ("Aarav Priya Rahul Ananya Vikram Sneha Arjun Kavya Rohan Isha John Maria Wei Fatima "
+               "Carlos Olga Kenji Amara Lucas Sofia").split()
+LAST_NAMES = ("Sharma Patel Iyer Reddy Gupta Nair Singh Das Smith Garcia Chen Khan Lopez Ivanova "
+              "Tanaka Okafor Silva Rossi").split()
+COMPANIES = ("Acme Corp, Globex, Initech, Umbrella Labs, Stark Industries, Wayne Enterprises, Hooli, "
+             "Vandelay Industries, Tyrell Systems, Cyberdyne").split(', ')
+UNIVERSITIES = ("IIT Bombay, Anna University, Stanford University, University of Toronto, "
+                "National University of Singapore, TU Munich, VIT Vellore").split(', ')
+DEGREES = ("Bachelor of Technology in Computer Science", "Master of Science in Data Science",
+           "Bachelor of Engineering in Information Technology", "MBA in Technology Management")
+VERBS = ("Developed Designed Maintained Deployed Migrated Optimized Automated Led Built Refactored "
+         "Monitored Scaled").split()
+OBJECTS = ("REST services", "data pipelines", "internal dashboards", "a recommendation engine",
+           "the CI/CD workflow", "batch ETL jobs", "customer-facing APIs", "a reporting platform",
+           "microservices", "the search backend")
+OUTCOMES = ("reducing latency by {n}%", "cutting costs by {n}%", "serving {n}k daily users",
+            "improving test coverage to {n}%", "handling {n} million events per day")
+NOISE = ("stakeholders agile scrum mentoring documentation on-call code review roadmap "
+         "cross-functional ownership").split()
+
+
+@lru_cache(maxsize=None)
+def _surface_forms():
+    # Canonical names and aliases, in taxonomy order
+    return tuple(get_taxonomy().ids)
+
+
+def _skills(rng, count):
+    """Skill mentions drawn from taxonomy names and aliases"""
+    forms = _surface_forms()
+    return rng.sample(forms, min(count, len(forms)))
+
+
+def resume_text(index, size='1kb', seed=0):
+    """Synthetic resume number `index`, about SIZES[size] characters long"""
+    target = SIZES[size] if isinstance(size, str) else int(size)
+    rng = random.Random(f"resume:{seed}:{index}")
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    handle = name.lower().replace(' ', '.')
+
+    lines = [
+        name,
+        rng.choice(("Software Engineer", "Data Scientist", "Backend Developer", "DevOps Engineer")),
+        f"Email: {handle}{index}@example.com",
+        f"Phone: +91-{rng.randint(6000000000, 9999999999)}",
+        "",
+        "SKILLS:",
+        ", ".join(_skills(rng, rng.randint(6, 14))),
+        "",
+        "EDUCATION:",
+        rng.choice(DEGREES),
+        f"{rng.choice(UNIVERSITIES)}, {rng.randint(2005, 2020)}-{rng.randint(2021, 2024)}",
+        "",
+        "EXPERIENCE:",
+    ]
+    length = sum(len(line) + 1 for line in lines)
+    while length < target:
+        if rng.random() < 0.15:
+            block = ["", f"{rng.choice(('Senior', 'Lead', ''))} Engineer at {rng.choice(COMPANIES)}".strip()]
+        else:
+            skills = ", ".join(_skills(rng, 2))
+            outcome = rng.choice(OUTCOMES).format(n=rng.randint(10, 90))
+            block = [f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {skills}, {outcome}; "
+                     f"{' '.join(rng.sample(NOISE, 3))}"]
+        lines.extend(block)
+        length += sum(len(line) + 1 for line in block)
+    return "\n".join(lines)
+
+
+def jd_text(index, seed=0):
+    """Synthetic job description number `index`"""
+    rng = random.Random(f"jd:{seed}:{index}")
+    n_required = rng.randint(4, 8)
+    skills = _skills(rng, n_required + rng.randint(2, 5))
+    required, nice = skills[:n_required], skills[n_required:]
+    return "\n".join([
+        f"{rng.choice(('Senior', 'Junior', 'Staff', ''))} {rng.choice(('Python', 'Data', 'Cloud', 'Backend'))} "
+        f"Developer".strip(),
+        "",
+        "REQUIRED SKILLS:",
+        *[f"- {skill}" for skill in required],
+        "",
+        "NICE TO HAVE:",
+        *[f"- {skill}" for skill in nice],
+        "",
+        "RESPONSIBILITIES:",
+        *[f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)}" for _ in range(rng.randint(3, 6))],
+    ])
+
+
+def _pdf_escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def pdf_bytes(text, width=95, lines_per_page=60):
+    """A minimal multi-page PDF (Helvetica, text wrapped at `width` characters)"""
+    lines = []
+    for line in text.split('\n'):
+        lines.extend(textwrap.wrap(line, width) or [''])
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        body = "BT /F1 10 Tf 50 760 Td 12 TL " + " ".join(f"({_pdf_escape(line)}) '" for line in page) + " ET"
+        stream = body.encode('latin-1', errors='replace')
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+                       b"/Resources << /Font << /F1 3 0 R >> >> >>" % len(objects))
+        kids.append(len(objects))
+    objects[1] = (b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % kid for kid in kids) +
+                  b"] /Count %d >>" % len(kids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    out.write(b"".join(b"%010d 00000 n \n" % offset for offset in offsets))
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def docx_bytes(text):
+    """A DOCX document with one paragraph per line"""
+    import docx
+
+    document = docx.Document()
+    for line in text.split('\n'):
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def document_bytes(text, fmt):
+    if fmt == 'pdf':
+        return pdf_bytes(text)
+    if fmt == 'docx':
+        return docx_bytes(text)
+    if fmt == 'txt':
+        return text.encode('utf-8')
+    raise ValueError(f"Unknown format {fmt!r}, expected one of {FORMATS}")
+
+
+def generate_corpus(directory, resumes=10, jds=1, formats=('txt',), size='1kb', seed=0):
+    """Write resumes/ and jds/ under `directory`; returns (resume files, JD files).
+
+    Resume i uses formats[i % len(formats)]. Files are written one at a
+    time, so memory use does not grow with the corpus size.
+    """
+    resume_dir = os.path.join(directory, 'resumes')
+    jd_dir = os.path.join(directory, 'jds')
+    os.makedirs(resume_dir, exist_ok=True)
+    os.makedirs(jd_dir, exist_ok=True)
+
+    width = len(str(max(resumes - 1, 0)))
+    resume_files = []
+    for i in range(resumes):
+        fmt = formats[i % len(formats)]
+        name = f"resume_{i:0{width}d}.{fmt}"
+        with open(os.path.join(resume_dir, name), 'wb') as f:
+            f.write(document_bytes(resume_text(i, size, seed), fmt))
+        resume_files.append(name)
+
+    jd_files = []
+    for j in range(jds):
+        name = f"jd_{j:03d}.txt"
+        with open(os.path.join(jd_dir, name), 'w', encoding='utf-8') as f:
+            f.write(jd_text(j, seed))
+        jd_files.append(name)
+    return resume_files, jd_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('directory')
+    parser.add_argument('--resumes', type=int, default=10)
+    parser.add_argument('--jds', type=int, default=1)
+    parser.add_argument('--formats', default='txt', help="comma-separated, from: " + ", ".join(FORMATS))
+    parser.add_argument('--size', default='1kb', help="one of " + ", ".join(SIZES) + ", or a character count")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    size = args.size if args.size in SIZES else int(args.size)
+    resume_files, jd_files = generate_corpus(args.directory, args.resumes, args.jds,
+                                             tuple(args.formats.split(',')), size, args.seed)
+    print(f"Wrote {len(resume_files)} resumes and {len(jd_files)} JDs to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""Timed benchmark suites for the parsing and matching pipeline, stored as JSON per commit.
+
+Every suite runs on the deterministic corpus from corpus.py, so two result
+files from different commits measure the same input. Suites cover text
+extraction (PDF, DOCX), basic and advanced field extraction, skill
+extraction, match_resume_to_jd and the end-to-end main.py pipeline.
+Results go to benchmarks/results/<commit>.json; --compare checks them
+against a baseline file and exits with status 1 on a regression.
+
+Run from the repository root:
+    python benchmarks/run_benchmarks.py --quick
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<baseline>.json
+    python benchmarks/run_benchmarks.py --compare OLD.json NEW.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, 'src'))
+
+from corpus import SIZES, document_bytes, generate_corpus, jd_text, resume_text
+
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+RESULTS_FORMAT_VERSION = 1
+SUITES = ('pdf_extract', 'docx_extract', 'basic_fields', 'advanced_fields', 'skill_extraction',
+          'match_resume_to_jd', 'end_to_end')
+
+
+def git_commit():
+    """(short commit hash, working tree dirty?) or ('unknown', False) outside git"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_DIR,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+    return commit, bool(status.strip())
+
+
+def time_runs(run, repeats):
+    """Call `run` once untimed to warm up, then `repeats` times; returns wall times in seconds"""
+    run()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summarize(timings, docs, bytes_=None):
+    timings = sorted(timings)
+    median = statistics.median(timings)
+    result = {
+        'docs': docs,
+        'repeats': len(timings),
+        'min_s': timings[0],
+        'median_s': median,
+        'mean_s': statistics.fmean(timings),
+        'p95_s': timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        'docs_per_s': docs / median if median else None,
+    }
+    if bytes_ is not None:
+        result['mb_per_s'] = bytes_ / 1e6 / median if median else None
+    return result
+
+
+def write_documents(directory, fmt, size, count, seed):
+    """Write `count` resumes in one format; returns (paths, total bytes)"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    total = 0
+    for i in range(count):
+        data = document_bytes(resume_text(i, size, seed), fmt)
+        path = os.path.join(directory, f"resume_{i}.{fmt}")
+        with open(path, 'wb') as f:
+            f.write(data)
+        paths.append(path)
+        total += len(data)
+    return paths, total
+
+
+def extract_suite(fmt, args, workdir):
+    from simple_parser import extract_text_from_docx, extract_text_from_pdf
+
+    extract = extract_text_from_pdf if fmt == 'pdf' else extract_text_from_docx
+    results = {}
+    for size in args.sizes:
+        paths, total = write_documents(os.path.join(workdir, f"{fmt}_{size}"), fmt, size, args.docs, args.seed)
+        timings = time_runs(lambda: [extract(path) for path in paths], args.repeats)
+        results[f"{fmt}_extract/{size}"] = summarize(timings, len(paths), total)
+    return results
+
+
+def text_suite(name, function, args):
+    """Time `function` over every resume text of each size"""
+    results = {}
+    for size in args.sizes:
+        texts = [resume_text(i, size, args.seed) for i in range(args.docs)]
+        total = sum(len(text.encode('utf-8')) for text in texts)
+        timings = time_runs(lambda: [function(text) for text in texts], args.repeats)
+        results[f"{name}/{size}"] = summarize(timings, len(texts), total)
+    return results
+
+
+def suite_pdf_extract(args, workdir):
+    return extract_suite('pdf', args, workdir)
+
+
+def suite_docx_extract(args, workdir):
+    return extract_suite('docx', args, workdir)
+
+
+def suite_basic_fields(args, workdir):
+    from simple_parser import extract_basic_fields
+
+    return text_suite('basic_fields', extract_basic_fields, args)
+
+
+def suite_advanced_fields(args, workdir):
+    import advanced_parser
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        available = advanced_parser.warm_up()
+    if not available:
+        return {'advanced_fields': {'skipped': f"spaCy model {advanced_parser.MODEL_NAME} is not installed"}}
+    return text_suite('advanced_fields', advanced_parser.extract_advanced_fields, args)
+
+
+def suite_skill_extraction(args, workdir):
+    from matcher import extract_skill_ids_from_resume
+
+    return text_suite('skill_extraction', extract_skill_ids_from_resume, args)
+
+
+def suite_match_resume_to_jd(args, workdir):
+    from lexical import LexicalIndex
+    from matcher import match_resume_to_jd
+
+    jd = jd_text(0, args.seed)
+    # BM25 statistics come from a reference corpus, built outside the timings
+    indexes = {'keyword': None,
+               'bm25': LexicalIndex([resume_text(i, args.sizes[0], args.seed) for i in range(args.docs)])}
+    results = {}
+    for scorer, index in indexes.items():
+        suite = text_suite(f"match_resume_to_jd/{scorer}",
+                           lambda text: match_resume_to_jd(text, jd, scorer, index), args)
+        results.update(suite)
+    return results
+
+
+def suite_end_to_end(args, workdir):
+    """main.py over a mixed txt/DOCX/PDF corpus, without the feature cache"""
+    import main as pipeline_main
+
+    root = os.path.join(workdir, 'end_to_end')
+    resume_files, _ = generate_corpus(os.path.join(root, 'data'), args.e2e_docs, args.e2e_jds,
+                                      ('txt', 'docx', 'pdf'), '1kb', args.seed)
+    os.makedirs(os.path.join(root, 'output'), exist_ok=True)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            pipeline_main.main(['--no-cache'])
+
+    previous = os.getcwd()
+    os.chdir(root)
+    try:
+        timings = time_runs(run, args.repeats)
+    finally:
+        os.chdir(previous)
+    return {'end_to_end/main': summarize(timings, len(resume_files))}
+
+
+def run_suites(args):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in args.suites:
+            print(f"Running {name}...", flush=True)
+            for suite, result in globals()[f"suite_{name}"](args, workdir).items():
+                results[suite] = result
+                if 'skipped' in result:
+                    print(f"  {suite}: skipped ({result['skipped']})")
+                else:
+                    print(f"  {suite}: median {result['median_s'] * 1000:.1f} ms for {result['docs']} docs "
+                          f"({result['docs_per_s']:.1f} docs/s)")
+    return results
+
+
+def compare_results(baseline, current, threshold):
+    """Print median time changes per suite; returns the names of suites slower than `threshold`"""
+    regressions = []
+    print(f"\nComparing {current.get('commit')} against baseline {baseline.get('commit')} "
+          f"(threshold {threshold:.0%})")
+    for suite, result in current['suites'].items():
+        before = baseline['suites'].get(suite)
+        if not before or 'median_s' not in before or 'median_s' not in result:
+            continue
+        change = result['median_s'] / before['median_s'] - 1 if before['median_s'] else 0.0
+        status = 'REGRESSION' if change > threshold else ('faster' if change < -threshold else 'ok')
+        if status == 'REGRESSION':
+            regressions.append(suite)
+        print(f"  {suite:<40} {before['median_s'] * 1000:>10.1f} ms -> {result['median_s'] * 1000:>10.1f} ms "
+              f"{change:>+8.1%}  {status}")
+    return regressions
+
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--suites', default=','.join(SUITES), help="comma-separated, from: " + ", ".join(SUITES))
+    parser.add_argument('--sizes', default='1kb,multipage', help="comma-separated, from: " + ", ".join(SIZES))
+    parser.add_argument('--docs', type=int, default=100, help="documents per suite and size")
+    parser.add_argument('--e2e-docs', type=int, default=300, help="resumes in the end-to-end corpus")
+    parser.add_argument('--e2e-jds', type=int, default=5)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--quick', action='store_true', help="small inputs and few repeats, for a smoke run")
+    parser.add_argument('--output', help="result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', nargs='+', metavar='RESULTS',
+                        help="baseline JSON to compare this run against, or two result files to compare "
+                             "without running")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative slowdown of the median that counts as a regression")
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) == 2:
+        regressions = compare_results(load_results(args.compare[0]), load_results(args.compare[1]), args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    if args.quick:
+        args.docs, args.e2e_docs, args.e2e_jds, args.repeats = 10, 30, 2, 2
+    args.suites = args.suites.split(',')
+    args.sizes = args.sizes.split(',')
+    unknown = [name for name in args.suites if name not in SUITES] + [s for s in args.sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown suite or size: {', '.join(unknown)}")
+
+    commit, dirty = git_commit()
+    results = {
+        'format_version': RESULTS_FORMAT_VERSION,
+        'commit': commit,
+        'dirty': dirty,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': {'docs': args.docs, 'sizes': args.sizes, 'repeats': args.repeats, 'seed': args.seed,
+                   'e2e_docs': args.e2e_docs, 'e2e_jds': args.e2e_jds},
+        'suites': run_suites(args),
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        baseline = load_results(args.compare[0])
+        if baseline.get('config') != results['config']:
+            print("Warning: baseline was run with a different configuration")
+        if compare_results(baseline, results, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,69 @@
-import spacy
-import re
+from importlib import metadata
+from simple_parser import extract_basic_fields
+from contact_extractor import extract_contacts
+from model_registry import get_model, is_loaded
+import metrics
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Please download the spaCy model first: python -m spacy download en_core_web_sm")
-    nlp = None
+MODEL_NAME = "en_core_web_sm"
 
-def extract_advanced_fields(text):
-    """Extract advanced fields using spaCy NER"""
-    if nlp is None:
-        return extract_basic_fields(text)
+# Only doc.ents is read, so everything except NER (and the token-to-vector
+# layer, if NER listens to it) is left out of the pipeline
+UNUSED_COMPONENTS = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter", "morphologizer"]
+
+DEFAULT_BATCH_SIZE = 32
+
+def load_ner_model(model_name=MODEL_NAME):
+    """Load a spaCy pipeline trimmed down to named entity recognition"""
+    # spaCy itself takes about a second to import, so it is only imported
+    # once a model is actually needed
+    import spacy
     
-    doc = nlp(text)
+    try:
+        model = spacy.load(model_name, exclude=UNUSED_COMPONENTS)
+    except OSError:
+        print(f"Please download the spaCy model first: python -m spacy download {model_name}")
+        return None
     
+    if "tok2vec" in model.pipe_names and not model.get_pipe("tok2vec").listening_components:
+        model.remove_pipe("tok2vec")
+    return model
+
+def get_nlp():
+    """Return the shared NER pipeline, loading it on first use (None if unavailable)"""
+    return get_model(('spacy', MODEL_NAME), load_ner_model)
+
+def warm_up():
+    """Load the NER model and run one tiny document through it.
+
+    Call before forking worker processes so they inherit a ready model, or
+    at app start-up to keep the load off the first user request.
+    """
+    model = get_nlp()
+    if model is not None:
+        model("Warm up")
+    return model is not None
+
+def is_model_loaded():
+    return is_loaded(('spacy', MODEL_NAME))
+
+def __getattr__(name):
+    # Keep `advanced_parser.nlp` working without loading the model at import
+    if name == 'nlp':
+        return get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def model_version():
+    """Installed NER model and spaCy versions, without loading the model"""
+    versions = []
+    for package in (MODEL_NAME, 'spacy'):
+        try:
+            versions.append(f"{package}=={metadata.version(package)}")
+        except metadata.PackageNotFoundError:
+            versions.append(f"{package}==missing")
+    return ';'.join(versions)
+
+def fields_from_doc(doc, text):
+    """Build the advanced field record from a processed spaCy doc"""
     entities = {
         'PERSON': [],
         'ORG': [],  # Companies, universities
@@ -29,12 +78,10 @@ def extract_advanced_fields(text):
         if ent.label_ in entities:
             entities[ent.label_].append(ent.text)
     
-    # Extract email and phone with regex (more reliable)
-    entities['EMAIL'] = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-    entities['PHONE'] = re.findall(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]', text)
-    
-    # Try to extract education
-    education = extract_education(text)
+    # Email, phone, URLs and education lines come from one regex pass (more reliable than NER)
+    contacts = extract_contacts(text)
+    entities['EMAIL'] = contacts.emails
+    entities['PHONE'] = contacts.phones
     
     return {
         'name': entities['PERSON'][0] if entities['PERSON'] else '',
@@ -42,22 +89,34 @@ def extract_advanced_fields(text):
         'phone': entities['PHONE'][0] if entities['PHONE'] else '',
         'organizations': list(set(entities['ORG'])),
         'locations': list(set(entities['GPE'])),
-        'education': education,
+        'education': contacts.education,
+        'urls': contacts.urls,
         'entities': entities
     }
 
-def extract_education(text):
-    """Extract education information using patterns"""
-    education_keywords = ['bachelor', 'master', 'phd', 'degree', 'university', 'college', 'institute']
-    education = []
-    
-    lines = text.split('\n')
-    for line in lines:
-        line_lower = line.lower()
-        if any(keyword in line_lower for keyword in education_keywords):
-            education.append(line.strip())
+@metrics.timed('advanced_fields')
+def extract_advanced_fields_batch(texts, batch_size=DEFAULT_BATCH_SIZE, n_process=1):
+    """Extract advanced fields for many texts with one nlp.pipe stream.
+
+    Returns one field record per text, in input order. `batch_size` and
+    `n_process` are passed straight to nlp.pipe.
+    """
+    texts = list(texts)
+    nlp = get_nlp()
+    if nlp is None:
+        return [extract_basic_fields(text) for text in texts]
     
-    return education
+    metrics.count('ner_documents_total', len(texts))
+    docs = nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+    return [fields_from_doc(doc, text) for doc, text in zip(docs, texts)]
+
+def extract_advanced_fields(text):
+    """Extract advanced fields using spaCy NER"""
+    return extract_advanced_fields_batch([text])[0]
+
+def extract_education(text):
+    """Lines mentioning a degree or institution (see contact_extractor.EDUCATION_KEYWORDS)"""
+    return extract_contacts(text).education
 
 if __name__ == "__main__":
     # Test advanced parser
@@ -0,0 +1,95 @@
+import re
+
+# Every repeat is bounded, so each match attempt looks at a fixed number of
+# characters and a scan is linear in the text length, whatever the input.
+EMAIL_PATTERN = r"[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,253}\.[A-Za-z]{2,24}\b"
+URL_PATTERN = (r"(?i:https?://|www\.)[^\s<>\"']{2,2048}"
+               r"|(?i:linkedin\.com|github\.com|gitlab\.com)/[^\s<>\"']{1,256}")
+# 10 to 15 digits (the E.164 maximum, plus a national trunk 0), each after
+# at most two separators, not part of a longer digit run: a run of numbers
+# in a pasted table is no longer swallowed whole as one "phone". A match
+# may not start with a year range ("2016-2020 ...") and no digit of it may
+# start a date ("4.0 2019.06.01"); a bare date is too short anyway.
+YEAR_RANGE_PATTERN = r"(?:19|20)[0-9]{2}\s{0,3}[-\u2013/ ]\s{0,3}(?:19|20)[0-9]{2}(?![0-9])"
+DATE_PATTERN = '|'.join(
+    rf"(?:19|20)[0-9]{{2}}{sep}[01]?[0-9]{sep}[0-3]?[0-9](?![0-9])"
+    rf"|[0-3]?[0-9]{sep}[01]?[0-9]{sep}(?:19|20)[0-9]{{2}}(?![0-9])"
+    for sep in (r"\.", "/", "-")
+)
+# The cheap separator check first spares most digits the full date check
+PHONE_DIGIT = rf"(?!(?=[0-9]{{1,4}}[./-][0-9])(?:{DATE_PATTERN}))[0-9]"
+PHONE_PATTERN = rf"(?<![0-9])[+(]?(?!{YEAR_RANGE_PATTERN}){PHONE_DIGIT}(?:[ .\-()]{{0,2}}{PHONE_DIGIT}){{9,14}}(?![0-9])"
+# Education keywords keep the substring semantics of the old line loop: a
+# keyword anywhere in a line, inside a word ("Headmaster") or a URL
+# ("github.com/master-thesis") too, marks the whole line.
+EDUCATION_KEYWORDS = ('bachelor', 'master', 'phd', 'degree', 'university', 'college', 'institute')
+
+# One alternation, scanned once. The leading lookahead and the word boundary
+# let the engine skip most positions (the middle of ordinary words) cheaply.
+CONTACT_REGEX = re.compile(
+    r"(?=[A-Za-z0-9._%+(-])"
+    rf"(?:\b(?:(?P<email>{EMAIL_PATTERN})|(?P<url>{URL_PATTERN}))"
+    rf"|(?P<phone>{PHONE_PATTERN}))"
+)
+
+# Sentence punctuation that follows a URL rather than belonging to it
+URL_TRAILING = '.,;:!?)]}'
+
+
+class ContactRecord:
+    """Emails, phone numbers, URLs and education lines found in a text.
+
+    Shared by the basic and advanced field extractors, so each resume is
+    scanned once however many fields are built from it.
+    """
+
+    __slots__ = ('emails', 'phones', 'urls', 'education')
+
+    def __init__(self, emails, phones, urls, education):
+        self.emails = emails
+        self.phones = phones
+        self.urls = urls
+        self.education = education
+
+    @property
+    def email(self):
+        return self.emails[0] if self.emails else ''
+
+    @property
+    def phone(self):
+        return self.phones[0] if self.phones else ''
+
+    def __repr__(self):
+        return (f"ContactRecord(emails={self.emails!r}, phones={self.phones!r}, urls={self.urls!r}, "
+                f"education={self.education!r})")
+
+
+def extract_contacts(text):
+    """Scan `text` for emails, phones, URLs and education lines, each in order of appearance"""
+    text = text or ''
+    emails = []
+    phones = []
+    urls = []
+    education = []
+    for match in CONTACT_REGEX.finditer(text):
+        kind = match.lastgroup
+        if kind == 'email':
+            emails.append(match.group('email'))
+        elif kind == 'phone':
+            phones.append(match.group('phone'))
+        else:
+            urls.append(match.group('url').rstrip(URL_TRAILING))
+    for line in text.split('\n'):
+        lowered = line.lower()
+        if any(keyword in lowered for keyword in EDUCATION_KEYWORDS):
+            education.append(line.strip())
+    return ContactRecord(emails, phones, urls, education)
+
+
+if __name__ == "__main__":
+    sample = """
+    Jane Doe | jane.doe@example.com | +1 (555) 123-4567
+    https://www.linkedin.com/in/janedoe, github.com/janedoe
+    Master of Science, Stanford University
+    """
+    print(extract_contacts(sample))
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+
+DEFAULT_CACHE_PATH = os.path.join("cache", "features.sqlite")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Bump to invalidate every entry when the record layout changes
+CACHE_FORMAT_VERSION = 1
+
+# Hits whose access times are held back before being written in one transaction
+ACCESS_FLUSH_SIZE = 1024
+
+
+def content_hash(data):
+    """Hex SHA-256 of a file's raw bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_content_hash(file_path, chunk_size=1024 * 1024):
+    """Hex SHA-256 of a file on disk, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def code_fingerprint(*parts):
+    """Hash source files (given by path) and version strings into a cache version.
+
+    Used so that editing parser logic, the skill taxonomy or the NER model
+    automatically invalidates old entries.
+    """
+    digest = hashlib.sha256(str(CACHE_FORMAT_VERSION).encode())
+    for part in parts:
+        if os.path.isfile(part):
+            with open(part, 'rb') as f:
+                digest.update(f.read())
+        else:
+            digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+
+class FeatureCache:
+    """Size-bounded, content-addressed SQLite store for extracted resume features.
+
+    Entries are keyed by (file content hash, version). Values are JSON
+    records compressed with zlib. When the total payload size exceeds
+    `max_bytes`, least recently used entries are evicted. Access times of
+    hits are batched and written every ACCESS_FLUSH_SIZE hits, before an
+    eviction and on close().
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._accessed = {}
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS features ("
+            " key TEXT PRIMARY KEY,"
+            " payload BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS features_lru ON features (last_access)")
+        self._conn.commit()
+        self._total_bytes = self._stored_bytes()
+
+    @staticmethod
+    def make_key(digest, version):
+        return f"{digest}:{version}"
+
+    # Subclasses storing something other than JSON records override these
+    @staticmethod
+    def encode(record):
+        return zlib.compress(json.dumps(record).encode('utf-8'))
+
+    @staticmethod
+    def decode(payload):
+        return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+    def get(self, digest, version):
+        """Return the cached record for a content hash and version, or None"""
+        key = self.make_key(digest, version)
+        row = self._conn.execute("SELECT payload FROM features WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._accessed[key] = time.time()
+        if len(self._accessed) >= ACCESS_FLUSH_SIZE:
+            self.flush()
+        return self.decode(row[0])
+
+    def put(self, digest, version, record):
+        """Store a JSON-serialisable record and evict old entries if over budget"""
+        key = self.make_key(digest, version)
+        payload = self.encode(record)
+
+        old = self._conn.execute("SELECT size FROM features WHERE key = ?", (key,)).fetchone()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO features (key, payload, size, last_access) VALUES (?, ?, ?, ?)",
+            (key, payload, len(payload), time.time())
+        )
+        self._total_bytes += len(payload) - (old[0] if old else 0)
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+        self._conn.commit()
+
+    def _write_access_times(self):
+        if self._accessed:
+            self._conn.executemany("UPDATE features SET last_access = ? WHERE key = ?",
+                                   [(accessed, key) for key, accessed in self._accessed.items()])
+            self._accessed.clear()
+
+    def flush(self):
+        """Write pending access times in one transaction"""
+        if self._accessed:
+            self._write_access_times()
+            self._conn.commit()
+
+    def _stored_bytes(self):
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM features").fetchone()[0]
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        # Other processes may share the file, so recount before deleting
+        self._write_access_times()
+        total = self._stored_bytes()
+        if total <= self.max_bytes:
+            self._total_bytes = total
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM features ORDER BY last_access").fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM features WHERE key = ?", doomed)
+        self._total_bytes = total
+
+    def clear(self):
+        self._accessed.clear()
+        self._conn.execute("DELETE FROM features")
+        self._conn.commit()
+        self._total_bytes = 0
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def stats(self):
+        entries, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM features").fetchone()
+        return {'entries': entries, 'bytes': total, 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,205 @@
+import json
+import os
+import time
+
+import pandas as pd
+
+from feature_cache import file_content_hash
+
+DEFAULT_MANIFEST_PATH = os.path.join("cache", "manifest.json")
+
+
+class Changes:
+    """Result of comparing a directory listing against the manifest"""
+
+    def __init__(self, added, changed, removed, entries):
+        self.added = added
+        self.changed = changed
+        self.removed = removed
+        self.entries = entries
+
+    @property
+    def dirty(self):
+        """Files that need to be (re)processed"""
+        return self.added + self.changed
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+
+    def summary(self):
+        return f"{len(self.added)} added, {len(self.changed)} changed, {len(self.removed)} removed"
+
+
+class Manifest:
+    """Path, size, mtime and content hash of every file seen in the last run.
+
+    Files whose size and mtime are unchanged are trusted without hashing;
+    otherwise the content hash decides, so a `touch` alone does not trigger
+    reprocessing.
+    """
+
+    def __init__(self, path=DEFAULT_MANIFEST_PATH):
+        self.path = path
+        self.sections = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.sections = json.load(f)
+
+    def diff(self, section, directory, file_names):
+        previous = self.sections.get(section, {})
+        entries = {}
+        added = []
+        changed = []
+
+        for file_name in sorted(file_names):
+            stat = os.stat(os.path.join(directory, file_name))
+            entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            old = previous.get(file_name)
+
+            if old and old['size'] == entry['size'] and old['mtime_ns'] == entry['mtime_ns']:
+                entry['sha256'] = old['sha256']
+            else:
+                entry['sha256'] = file_content_hash(os.path.join(directory, file_name))
+                if old is None:
+                    added.append(file_name)
+                elif old['sha256'] != entry['sha256']:
+                    changed.append(file_name)
+            entries[file_name] = entry
+
+        removed = sorted(name for name in previous if name not in entries)
+        return Changes(added, changed, removed, entries)
+
+    def update(self, section, changes):
+        self.sections[section] = changes.entries
+
+    def save(self):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.sections, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class IncrementalRun:
+    """Work out which resume × JD pairs need scoring and merge them into the last output.
+
+    Changed or added resumes are scored against every JD, and changed or
+    added JDs against every resume. With `top_k`, or `rescore_all` for
+    scorers that depend on the whole corpus, any resume change re-ranks
+    every JD. Rows for deleted files are dropped from
+    the previous ranking, everything else is carried over unchanged.
+    """
+
+    def __init__(self, manifest_path, resume_dir, resume_files, jd_dir, jd_files, output_path, version='',
+                 top_k=None, min_score=None, rescore_all=False):
+        self.manifest = Manifest(manifest_path)
+        self.output_path = output_path
+        # Ranking options decide which rows were kept, so they count as part of the version
+        self.version = f"{version}:top_k={top_k}:min_score={min_score}"
+        # Each output file keeps its own history, so the CLIs don't see each other's runs
+        self._resume_section = f"{output_path}:resumes"
+        self._jd_section = f"{output_path}:jds"
+        self.resume_changes = self.manifest.diff(self._resume_section, resume_dir, resume_files)
+        self.jd_changes = self.manifest.diff(self._jd_section, jd_dir, jd_files)
+        self.all_resumes = list(resume_files)
+
+        # Without a previous output there is nothing to merge into, and a
+        # different parser/taxonomy version makes every old row stale
+        previous_version = self.manifest.sections.get(f"{output_path}:version")
+        if not os.path.exists(output_path) or previous_version != self.version:
+            self.resume_changes.added = sorted(resume_files)
+            self.resume_changes.changed = []
+            self.jd_changes.added = sorted(jd_files)
+            self.jd_changes.changed = []
+
+        self._dirty_resumes = set(self.resume_changes.dirty)
+        self._dirty_jds = set(self.jd_changes.dirty)
+        if (top_k is not None or rescore_all) and self.resume_changes:
+            # A changed or deleted resume can let one outside the previous
+            # top K back in, or shift corpus-wide term statistics, so every
+            # JD's ranking is rebuilt
+            self._dirty_jds = set(jd_files)
+
+    @property
+    def has_changes(self):
+        return bool(self.resume_changes or self.jd_changes)
+
+    def summary(self):
+        return f"resumes: {self.resume_changes.summary()}; JDs: {self.jd_changes.summary()}"
+
+    def resumes_to_ingest(self):
+        """Resume files the ingest stage has to (re)load for this run"""
+        if self._dirty_jds:
+            # New or edited JDs are scored against every resume
+            return self.all_resumes
+        return [name for name in self.all_resumes if name in self._dirty_resumes]
+
+    def needs_scoring(self, resume_file, jd_file):
+        return resume_file in self._dirty_resumes or jd_file in self._dirty_jds
+
+    def merge(self, new_rows, sort_column='match_score', top_k=None):
+        """Previous output minus stale rows, plus `new_rows`, sorted like a full run"""
+        stale_resumes = self._dirty_resumes | set(self.resume_changes.removed)
+        stale_jds = self._dirty_jds | set(self.jd_changes.removed)
+
+        new = pd.DataFrame(new_rows)
+        frames = []
+        if os.path.exists(self.output_path) and os.path.getsize(self.output_path):
+            previous = pd.read_csv(self.output_path, keep_default_na=False)
+            if len(previous):
+                keep = ~previous['resume_file'].isin(stale_resumes) & ~previous['jd_file'].isin(stale_jds)
+                # Columns follow this run, e.g. when a scorer was switched off
+                frames.append(previous[keep] if new.empty else previous[keep].reindex(columns=new.columns))
+        if new_rows:
+            frames.append(new)
+        if not frames:
+            return new
+
+        df = pd.concat(frames, ignore_index=True)
+        df = df.sort_values([sort_column, 'resume_file'], ascending=[False, True], kind='stable')
+        if top_k is not None:
+            df = df.groupby('jd_file', sort=False).head(top_k)
+        return df
+
+    def commit(self):
+        """Record the current file state once the merged output is written"""
+        self.manifest.update(self._resume_section, self.resume_changes)
+        self.manifest.update(self._jd_section, self.jd_changes)
+        self.manifest.sections[f"{self.output_path}:version"] = self.version
+        self.manifest.save()
+
+
+def directory_signature(directories):
+    """Cheap snapshot of file names, sizes and mtimes used to poll for changes"""
+    signature = []
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    signature.append((directory, entry.name, stat.st_size, stat.st_mtime_ns))
+    return frozenset(signature)
+
+
+def watch(directories, run_pass, interval=5.0):
+    """Run `run_pass` now and again whenever a file in `directories` changes.
+
+    Polls file metadata every `interval` seconds, which works on any
+    filesystem (including network mounts where inotify is unavailable).
+    Stops on Ctrl+C.
+    """
+    last = None
+    try:
+        while True:
+            signature = directory_signature(directories)
+            if signature != last:
+                run_pass()
+                # Files changed while the pass ran no longer match this
+                # snapshot, so they trigger another pass
+                last = signature
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
@@ -1,29 +1,20 @@
 import re
 import json
+from taxonomy import get_taxonomy
+from text_decoding import read_text
+
+def extract_skill_ids_from_jd(jd_text):
+    """Extract taxonomy skill IDs from job description text"""
+    return get_taxonomy().find_ids(jd_text)
 
 def extract_skills_from_jd(jd_text):
-    """Extract skills from job description using simple keyword matching"""
-    # Common tech skills dictionary
-    tech_skills = [
-        'python', 'java', 'javascript', 'sql', 'aws', 'docker', 'kubernetes',
-        'react', 'node.js', 'django', 'flask', 'mongodb', 'mysql', 'postgresql',
-        'git', 'jenkins', 'linux', 'html', 'css', 'typescript', 'angular', 'vue'
-    ]
-    
-    found_skills = []
-    jd_lower = jd_text.lower()
-    
-    for skill in tech_skills:
-        if skill in jd_lower:
-            found_skills.append(skill)
-    
-    return found_skills
+    """Extract skills from job description using the shared skill taxonomy"""
+    return get_taxonomy().find(jd_text)
 
 def parse_jd_file(jd_path):
     """Parse a job description file and extract requirements"""
     try:
-        with open(jd_path, 'r', encoding='utf-8') as f:
-            jd_text = f.read()
+        jd_text = read_text(jd_path)
         
         skills = extract_skills_from_jd(jd_text)
         
@@ -0,0 +1,234 @@
+import math
+import re
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+LEXICAL_METHODS = ('bm25', 'tfidf')
+
+# Keeps tech tokens such as c++, c# and node.js intact
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+STOP_WORDS = frozenset("""
+a about above after all also am an and any are as at be been being below between both but by can could
+did do does doing down during each few for from further had has have having he her here hers him his how
+i if in into is it its itself just me more most my no nor not of off on once only or other our ours out
+over own same she should so some such than that the their theirs them then there these they this those
+through to too under until up very was we were what when where which while who whom why will with would
+you your yours
+""".split())
+
+
+def tokenize(text):
+    """Lowercased word tokens without stop words"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+class LexicalIndex:
+    """Term statistics and weighted sparse vectors for a corpus of resumes.
+
+    Built once at ingest. Every resume becomes a row of a sparse matrix
+    holding its BM25 term weights (or L2-normalised TF-IDF weights), so
+    scoring a JD against the whole corpus is one sparse matrix-vector
+    product. Scores are
+    percentages: TF-IDF is cosine similarity, BM25 is relative to an
+    average-length resume containing each query term once (capped at 100).
+    """
+
+    def __init__(self, texts, method='bm25', k1=1.2, b=0.75):
+        if method not in LEXICAL_METHODS:
+            raise ValueError(f"Unknown lexical method {method!r}, expected one of {LEXICAL_METHODS}")
+        self.method = method
+        self.k1 = k1
+        self.b = b
+        self.vocabulary = {}
+
+        indptr = [0]
+        indices = []
+        counts = []
+        for text in texts:
+            for term, count in Counter(tokenize(text)).items():
+                indices.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                counts.append(count)
+            indptr.append(len(indices))
+
+        self.n_docs = len(indptr) - 1
+        tf = sparse.csr_matrix((np.asarray(counts, dtype=np.float64), np.asarray(indices, dtype=np.int64),
+                                np.asarray(indptr, dtype=np.int64)), shape=(self.n_docs, len(self.vocabulary)))
+        self.doc_freq = np.bincount(tf.indices, minlength=len(self.vocabulary))
+        self.idf = self._idf(self.doc_freq)
+        self.terms = [None] * len(self.vocabulary)
+        for term, term_id in self.vocabulary.items():
+            self.terms[term_id] = term
+        # Column-wise, so a query reads only the postings of its own terms
+        self.matrix = self._weights(tf).tocsc()
+
+    def _idf(self, doc_freq):
+        if self.method == 'bm25':
+            return np.log1p((self.n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+        return np.log((1 + self.n_docs) / (1 + doc_freq)) + 1
+
+    def _weights(self, tf):
+        weights = tf.copy()
+        rows = np.repeat(np.arange(self.n_docs), np.diff(tf.indptr))
+        if self.method == 'bm25':
+            lengths = np.asarray(tf.sum(axis=1)).ravel()
+            self.average_length = lengths.mean() if self.n_docs and lengths.mean() > 0 else 1.0
+            norm = self.k1 * (1 - self.b + self.b * lengths / self.average_length)
+            weights.data = self.idf[tf.indices] * tf.data * (self.k1 + 1) / (tf.data + norm[rows])
+        else:
+            weights.data = (1 + np.log(tf.data)) * self.idf[tf.indices]
+            norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+            weights.data /= np.where(norms > 0, norms, 1)[rows]
+        return weights
+
+    def query_vector(self, text):
+        """Return (term IDs, query weights, normaliser) for a JD text"""
+        counts = Counter(tokenize(text))
+        known = [(self.vocabulary[term], count) for term, count in counts.items() if term in self.vocabulary]
+        term_ids = np.asarray([term_id for term_id, _ in known], dtype=np.int64)
+
+        if self.method == 'bm25':
+            # Each distinct query term counts once; unseen terms still raise
+            # the bar, as if no resume contained them
+            values = np.ones(len(term_ids))
+            unseen = len(counts) - len(known)
+            normaliser = self.idf[term_ids].sum() + unseen * self._idf(np.zeros(1))[0]
+        else:
+            tf = np.asarray([count for _, count in known], dtype=np.float64)
+            values = (1 + np.log(tf)) * self.idf[term_ids] if len(tf) else tf
+            unseen = [count for term, count in counts.items() if term not in self.vocabulary]
+            unseen_weight = (1 + np.log(np.asarray(unseen, dtype=np.float64))) * self._idf(np.zeros(1))[0]
+            normaliser = math.sqrt(float((values ** 2).sum() + (unseen_weight ** 2).sum()))
+        return term_ids, values, normaliser
+
+    def scores(self, jd_text):
+        """Percentage score of every resume for one JD, from a single sparse product.
+
+        Only the postings of the JD's terms are touched.
+        """
+        term_ids, values, normaliser = self.query_vector(jd_text)
+        if not normaliser or not self.n_docs:
+            return np.zeros(self.n_docs)
+        scores = (self.matrix[:, term_ids] @ values) / normaliser * 100
+        return np.minimum(scores, 100) if self.method == 'bm25' else scores
+
+    def document_weights(self, text):
+        """{term ID: weight} of a document outside the corpus, weighted with the corpus statistics.
+
+        The weights are those the document would get as a row of `matrix`
+        with the corpus as it is; terms the corpus never saw have no column
+        but still count towards BM25 length and the TF-IDF norm.
+        """
+        counts = Counter(tokenize(text))
+        known = [(self.vocabulary[term], count) for term, count in counts.items() if term in self.vocabulary]
+        if self.method == 'bm25':
+            norm = self.k1 * (1 - self.b + self.b * sum(counts.values()) / self.average_length)
+            return {term_id: float(self.idf[term_id]) * count * (self.k1 + 1) / (count + norm)
+                    for term_id, count in known}
+
+        unseen_idf = self._idf(np.zeros(1))[0]
+        weights = {term_id: (1 + math.log(count)) * float(self.idf[term_id]) for term_id, count in known}
+        unseen = [(1 + math.log(count)) * unseen_idf for term, count in counts.items() if term not in self.vocabulary]
+        norm = math.sqrt(sum(w * w for w in weights.values()) + sum(w * w for w in unseen))
+        return {term_id: weight / norm for term_id, weight in weights.items()} if norm else weights
+
+    def score_document(self, text, jd_text, n_terms=5):
+        """(percentage score, top contributing terms) of a document outside the corpus for one JD.
+
+        Equal to scores(jd_text) for a resume whose text is in the corpus.
+        """
+        weights = self.document_weights(text)
+        term_ids, values, normaliser = self.query_vector(jd_text)
+        contributions = [(weights[term_id] * value, term_id)
+                         for term_id, value in zip(term_ids.tolist(), values.tolist()) if term_id in weights]
+        if not normaliser or not contributions:
+            return 0.0, []
+        score = sum(contribution for contribution, _ in contributions) / normaliser * 100
+        best = sorted(contributions, key=lambda item: -item[0])[:n_terms]
+        return (min(score, 100) if self.method == 'bm25' else score), [self.terms[term_id] for _, term_id in best]
+
+    def contributions(self, jd_text):
+        """(CSR matrix of each resume's per-term score contributions, term IDs) for one JD"""
+        term_ids, values, _ = self.query_vector(jd_text)
+        return (self.matrix[:, term_ids] @ sparse.diags(values)).tocsr(), term_ids
+
+    def top_terms(self, contributions, term_ids, doc, n=5):
+        """The query terms contributing most to one resume's score"""
+        row = contributions[doc]
+        best = np.argsort(-row.data, kind='stable')[:n]
+        return [self.terms[term_ids[row.indices[i]]] for i in best]
+
+
+class LexicalScorer:
+    """BM25 / TF-IDF scores for resume × JD pairs, looked up by resume file and JD name.
+
+    A JD's column is computed on first use with one sparse product over
+    all resumes. Replaces the keyword score rather than blending with it.
+    """
+
+    def __init__(self, index, resume_keys, jd_keys, jd_texts):
+        self.index = index
+        self.score_column = f"{index.method}_score"
+        self._row = {key: i for i, key in enumerate(resume_keys)}
+        self._jd_text = dict(zip(jd_keys, jd_texts))
+        # Scoring runs one JD at a time, so only the current JD is kept
+        self._jd_key = None
+        self._scores_column = None
+        self._contributions = None
+
+    def _scores(self, jd_key):
+        if jd_key != self._jd_key:
+            self._jd_key = jd_key
+            self._scores_column = self.index.scores(self._jd_text[jd_key])
+            self._contributions = None
+        return self._scores_column
+
+    def component_score(self, resume_key, jd_key):
+        return round(float(self._scores(jd_key)[self._row[resume_key]]), 2)
+
+    def rescore(self, score, resume_key, jd_key):
+        return float(self._scores(jd_key)[self._row[resume_key]])
+
+    def reason(self, resume_key, jd_key):
+        self._scores(jd_key)
+        if self._contributions is None:
+            self._contributions = self.index.contributions(self._jd_text[jd_key])
+        terms = self.index.top_terms(*self._contributions, self._row[resume_key])
+        return relevance_reason(self.index.method, self.component_score(resume_key, jd_key), terms)
+
+
+class DocumentLexicalScorer:
+    """LexicalScorer for one resume text and one JD, scored against a corpus it need not belong to.
+
+    Lets single-pair callers (match_resume_to_jd) use real corpus term
+    statistics instead of a corpus of one document.
+    """
+
+    def __init__(self, index, resume_text, jd_text):
+        self.method = index.method
+        self.score_column = f"{index.method}_score"
+        self._score, self._terms = index.score_document(resume_text, jd_text)
+
+    def component_score(self, resume_key, jd_key):
+        return round(self._score, 2)
+
+    def rescore(self, score, resume_key, jd_key):
+        return self._score
+
+    def reason(self, resume_key, jd_key):
+        return relevance_reason(self.method, self.component_score(resume_key, jd_key), self._terms)
+
+
+def relevance_reason(method, score, terms):
+    label = "BM25" if method == 'bm25' else "TF-IDF"
+    relevance = f"{label} relevance: {score}%"
+    return f"{relevance} ({', '.join(terms)})" if terms else relevance
+
+
+def lexical_scorer(records, jd_texts, profiles, method='bm25'):
+    """LexicalScorer over ingest records and JD texts"""
+    index = LexicalIndex([record['text'] for record in records], method=method)
+    return LexicalScorer(index, [record['resume_file'] for record in records],
+                         [profile.name for profile in profiles], jd_texts)
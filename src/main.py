@@ -1,10 +1,36 @@
+import argparse
 import os
-import sys
-from simple_parser import extract_text_from_pdf, extract_text_from_docx, extract_basic_fields
-from matcher import match_resume_to_jd
-import pandas as pd
+from simple_parser import extract_basic_fields, extract_document_text
+from pipeline import (add_ingest_arguments, add_ranking_arguments, add_incremental_arguments, add_semantic_arguments,
+                      add_output_arguments, add_metrics_arguments, metrics_session, run_pipeline)
+from incremental import watch
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Match resumes in data/resumes against JDs in data/jds")
+    add_ingest_arguments(parser)
+    add_ranking_arguments(parser)
+    add_incremental_arguments(parser)
+    add_semantic_arguments(parser)
+    add_output_arguments(parser)
+    add_metrics_arguments(parser)
+    return parser.parse_args(argv)
+
+OUTPUT_PATH = 'output/ranking_results.csv'
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.watch is not None:
+        # Keep rankings fresh: an incremental pass whenever the data changes
+        watch(["data/resumes", "data/jds"], lambda: run_instrumented(args), interval=args.watch)
+    else:
+        run_instrumented(args)
+
+def run_instrumented(args):
+    """One pipeline pass, with metrics and profiling when requested"""
+    with metrics_session(args, extract_resume_text, extract_basic_fields):
+        run(args)
+
+def run(args):
     print("=== Resume Parser & Matcher Pipeline ===")
     
     # Check if data directories exist
@@ -32,66 +58,37 @@ def main():
     
     print(f"Found {len(resume_files)} resume files and {len(jd_files)} JD files")
     
-    # Process all combinations
-    results = []
-    
-    for jd_file in jd_files:
-        jd_path = os.path.join("data/jds", jd_file)
-        with open(jd_path, 'r', encoding='utf-8') as f:
-            jd_text = f.read()
-        
-        for resume_file in resume_files:
-            print(f"\n--- Matching {resume_file} with {jd_file} ---")
-            resume_path = os.path.join("data/resumes", resume_file)
-            
-            # Extract resume text
-            text = extract_resume_text(resume_path)
-            if not text:
-                continue
-            
-            # Extract basic fields
-            fields = extract_basic_fields(text)
-            
-            # Match with JD
-            match_result = match_resume_to_jd(text, jd_text)
-            
-            # Store results
-            result = {
-                'resume_file': resume_file,
-                'jd_file': jd_file,
-                'candidate_name': os.path.splitext(resume_file)[0],
-                'email': fields['email'],
-                'phone': fields['phone'],
-                'match_score': match_result['match_score'],
-                'resume_skills_count': match_result['resume_skills_count'],
-                'jd_skills_count': match_result['jd_skills_count'],
-                'matched_skills_count': match_result['matched_count'],
-                'reasons': ' | '.join(match_result['reasons'])
-            }
-            results.append(result)
-            
-            # Print immediate results
-            print(f"Match Score: {match_result['match_score']}%")
-            for reason in match_result['reasons']:
-                print(f"  - {reason}")
-    
-    # Save results to CSV
-    if results:
-        df = pd.DataFrame(results)
-        df = df.sort_values('match_score', ascending=False)
-        df.to_csv('output/ranking_results.csv', index=False)
-        print(f"\n=== Results saved to output/ranking_results.csv ===")
+    df = run_pipeline(args, resume_files, jd_files, OUTPUT_PATH, extract_resume_text, extract_basic_fields,
+                      build_row, print_row)
+    if df is not None and len(df):
         print(df[['candidate_name', 'match_score', 'reasons']].head())
 
-def extract_resume_text(file_path):
-    """Extract text from resume file based on type"""
-    if file_path.endswith('.pdf'):
-        return extract_text_from_pdf(file_path)
-    elif file_path.endswith('.docx'):
-        return extract_text_from_docx(file_path)
-    else:  # txt file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+def build_row(record, profile, match_result):
+    """Result row for one resume x JD pair; the pipeline adds the reasons where they are written"""
+    resume_file = record['resume_file']
+    fields = record['fields']
+    return {
+        'resume_file': resume_file,
+        'jd_file': profile.name,
+        'candidate_name': os.path.splitext(resume_file)[0],
+        'email': fields['email'],
+        'phone': fields['phone'],
+        'match_score': match_result['match_score'],
+        'resume_skills_count': match_result['resume_skills_count'],
+        'jd_skills_count': match_result['jd_skills_count'],
+        'matched_skills_count': match_result['matched_count']
+    }
+
+def print_row(result, match_result):
+    """Print immediate results"""
+    print(f"\n--- Matching {result['resume_file']} with {result['jd_file']} ---")
+    print(f"Match Score: {match_result['match_score']}%")
+    for reason in match_result['reasons']:
+        print(f"  - {reason}")
+
+def extract_resume_text(file_path, max_pages=None, max_chars=None):
+    """Extract text from resume file based on type, within the optional page / character budgets"""
+    return extract_document_text(file_path, max_pages=max_pages, max_chars=max_chars)
 
 def create_test_files():
     """Create test resume and JD files"""
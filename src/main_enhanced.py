@@ -1,11 +1,41 @@
 
+import argparse
 import os
-import pandas as pd
-from simple_parser import extract_text_from_pdf, extract_text_from_docx
-from advanced_parser import extract_advanced_fields
-from matcher import match_resume_to_jd
+from functools import partial
+from simple_parser import extract_document_text
+from advanced_parser import DEFAULT_BATCH_SIZE, extract_advanced_fields, extract_advanced_fields_batch, warm_up
+from pipeline import (add_ingest_arguments, add_ranking_arguments, add_incremental_arguments, add_semantic_arguments,
+                      add_output_arguments, add_metrics_arguments, metrics_session, run_pipeline)
+from incremental import watch
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Match resumes against JDs with spaCy NER field extraction")
+    add_ingest_arguments(parser)
+    add_ranking_arguments(parser)
+    add_incremental_arguments(parser)
+    add_semantic_arguments(parser)
+    add_output_arguments(parser)
+    add_metrics_arguments(parser)
+    parser.add_argument('--ner-batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"texts per nlp.pipe batch (default: {DEFAULT_BATCH_SIZE})")
+    return parser.parse_args(argv)
+
+OUTPUT_PATH = 'output/enhanced_ranking_results.csv'
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.watch is not None:
+        # Keep rankings fresh: an incremental pass whenever the data changes
+        watch(["data/resumes", "data/jds"], lambda: run_instrumented(args), interval=args.watch)
+    else:
+        run_instrumented(args)
+
+def run_instrumented(args):
+    """One pipeline pass, with metrics and profiling when requested"""
+    with metrics_session(args, extract_resume_text, extract_advanced_fields):
+        run(args)
+
+def run(args):
     print("=== ENHANCED Resume Parser with spaCy NER ===")
     
     # Ensure directories exist
@@ -23,79 +53,49 @@ def main():
     
     print(f"Processing {len(resume_files)} resumes against {len(jd_files)} JDs")
     
-    results = []
+    df = run_pipeline(args, resume_files, jd_files, OUTPUT_PATH, extract_resume_text, extract_advanced_fields,
+                      build_row, print_row,
+                      extract_fields_batch=partial(extract_advanced_fields_batch, batch_size=args.ner_batch_size),
+                      warm_up=warm_up)
     
-    for jd_file in jd_files:
-        jd_path = os.path.join("data/jds", jd_file)
-        with open(jd_path, 'r', encoding='utf-8') as f:
-            jd_text = f.read()
-        
-        for resume_file in resume_files:
-            print(f"\n--- Analyzing {resume_file} ---")
-            resume_path = os.path.join("data/resumes", resume_file)
-            
-            # Extract text
-            text = extract_resume_text(resume_path)
-            if not text:
-                continue
-            
-            # Extract ADVANCED fields with spaCy
-            advanced_fields = extract_advanced_fields(text)
-            
-            # Match with JD
-            match_result = match_resume_to_jd(text, jd_text)
-            
-            # Store enhanced results
-            result = {
-                'resume_file': resume_file,
-                'jd_file': jd_file,
-                'candidate_name': advanced_fields.get('name', os.path.splitext(resume_file)[0]),
-                'email': advanced_fields.get('email', ''),
-                'phone': advanced_fields.get('phone', ''),
-                'organizations': ', '.join(advanced_fields.get('organizations', [])[:3]),
-                'education': ', '.join(advanced_fields.get('education', [])[:2]),
-                'match_score': match_result['match_score'],
-                'resume_skills_count': match_result['resume_skills_count'],
-                'jd_skills_count': match_result['jd_skills_count'],
-                'matched_skills_count': match_result['matched_count'],
-                'reasons': ' | '.join(match_result['reasons'])
-            }
-            results.append(result)
-            
-            # Print detailed analysis
-            print(f" Name: {result['candidate_name']}")
-            print(f" Email: {result['email']}")
-            print(f" Phone: {result['phone']}")
-            print(f" Education: {result['education']}")
-            print(f" Organizations: {result['organizations']}")
-            print(f" Match Score: {match_result['match_score']}%")
-            for reason in match_result['reasons']:
-                print(f"   - {reason}")
-    
-    # Save enhanced results
-    if results:
-        df = pd.DataFrame(results)
-        df = df.sort_values('match_score', ascending=False)
-        df.to_csv('output/enhanced_ranking_results.csv', index=False)
-        print(f"\n=== Enhanced results saved to output/enhanced_ranking_results.csv ===")
-        
+    if df is not None and len(df):
         # Show top candidates
         print("\n��� TOP CANDIDATES:")
         print(df[['candidate_name', 'match_score', 'education', 'organizations']].head().to_string(index=False))
 
-def extract_resume_text(file_path):
-    """Extract text from resume file based on type"""
-    if file_path.endswith('.pdf'):
-        return extract_text_from_pdf(file_path)
-    elif file_path.endswith('.docx'):
-        return extract_text_from_docx(file_path)
-    else:  # txt file
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except UnicodeDecodeError:
-            with open(file_path, 'r', encoding='latin-1') as f:
-                return f.read()
+def build_row(record, profile, match_result):
+    """Enhanced result row for one resume x JD pair; the pipeline adds the reasons where they are written"""
+    resume_file = record['resume_file']
+    advanced_fields = record['fields']
+    return {
+        'resume_file': resume_file,
+        'jd_file': profile.name,
+        'candidate_name': advanced_fields.get('name', os.path.splitext(resume_file)[0]),
+        'email': advanced_fields.get('email', ''),
+        'phone': advanced_fields.get('phone', ''),
+        'organizations': ', '.join(advanced_fields.get('organizations', [])[:3]),
+        'education': ', '.join(advanced_fields.get('education', [])[:2]),
+        'match_score': match_result['match_score'],
+        'resume_skills_count': match_result['resume_skills_count'],
+        'jd_skills_count': match_result['jd_skills_count'],
+        'matched_skills_count': match_result['matched_count']
+    }
+
+def print_row(result, match_result):
+    """Print detailed analysis"""
+    print(f"\n--- Analyzing {result['resume_file']} ---")
+    print(f" Name: {result['candidate_name']}")
+    print(f" Email: {result['email']}")
+    print(f" Phone: {result['phone']}")
+    print(f" Education: {result['education']}")
+    print(f" Organizations: {result['organizations']}")
+    print(f" Match Score: {match_result['match_score']}%")
+    for reason in match_result['reasons']:
+        print(f"   - {reason}")
+
+def extract_resume_text(file_path, max_pages=None, max_chars=None):
+    """Extract text from resume file based on type, within the optional page / character budgets"""
+    return extract_document_text(file_path, max_pages=max_pages, max_chars=max_chars)
 
 if __name__ == "__main__":
     main()
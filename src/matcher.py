@@ -1,28 +1,38 @@
-import re
-from jd_parser import extract_skills_from_jd
+from collections.abc import Mapping
+from dataclasses import dataclass
+from jd_parser import extract_skill_ids_from_jd
+from lexical import LEXICAL_METHODS, DocumentLexicalScorer, LexicalIndex
+from taxonomy import get_taxonomy
+import metrics
+
+SCORERS = ('keyword',) + LEXICAL_METHODS
+
+@dataclass(frozen=True)
+class JobProfile:
+    """Everything the matcher needs from a JD, parsed once and reused.
+
+    Profiles are immutable and hashable, so they can be shared across
+    resumes, used as dict keys and cached.
+    """
+    name: str
+    skill_ids: tuple
+    skills: tuple
+
+    @classmethod
+    def from_text(cls, jd_text, name=''):
+        """Parse a job description into a reusable profile"""
+        skill_ids = tuple(sorted(extract_skill_ids_from_jd(jd_text)))
+        skills = tuple(get_taxonomy().to_names(skill_ids))
+        return cls(name=name, skill_ids=skill_ids, skills=skills)
+
+@metrics.timed('skill_extraction')
+def extract_skill_ids_from_resume(resume_text):
+    """Extract taxonomy skill IDs from resume text"""
+    return get_taxonomy().find_ids(resume_text)
 
 def extract_skills_from_resume(resume_text):
-    """Extract skills from resume text using keyword matching"""
-    # Expanded tech skills dictionary
-    tech_skills = [
-        'python', 'java', 'javascript', 'sql', 'aws', 'docker', 'kubernetes',
-        'react', 'node.js', 'django', 'flask', 'mongodb', 'mysql', 'postgresql',
-        'git', 'jenkins', 'linux', 'html', 'css', 'typescript', 'angular', 'vue',
-        'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift', 'kotlin',
-        'azure', 'gcp', 'cloud', 'machine learning', 'ml', 'ai', 'tensorflow',
-        'pytorch', 'pandas', 'numpy', 'scikit-learn', 'data analysis',
-        'rest api', 'graphql', 'microservices', 'ci/cd', 'devops'
-    ]
-    
-    found_skills = []
-    resume_lower = resume_text.lower()
-    
-    for skill in tech_skills:
-        # Use word boundaries to avoid partial matches
-        if re.search(r'\b' + re.escape(skill) + r'\b', resume_lower):
-            found_skills.append(skill)
-    
-    return found_skills
+    """Extract skills from resume text using the shared skill taxonomy"""
+    return get_taxonomy().find(resume_text)
 
 def calculate_match_score(resume_skills, jd_skills):
     """Calculate match score between resume and JD skills"""
@@ -38,6 +48,13 @@ def calculate_match_score(resume_skills, jd_skills):
     
     return match_score, matched_skills, missing_skills
 
+def score_skill_ids(resume_ids, profile):
+    """Unrounded match score of skill IDs against a JobProfile, without building skill lists"""
+    if not profile.skill_ids:
+        return 0
+    matched = sum(1 for skill_id in profile.skill_ids if skill_id in resume_ids)
+    return (matched / len(profile.skill_ids)) * 100
+
 def generate_match_reasons(matched_skills, missing_skills, score):
     """Generate human-readable reasons for the match score"""
     reasons = []
@@ -66,29 +83,190 @@ def generate_match_reasons(matched_skills, missing_skills, score):
     
     return reasons
 
-def match_resume_to_jd(resume_text, jd_text):
-    """Main function to match a resume against a job description"""
-    # Extract skills from both
-    resume_skills = extract_skills_from_resume(resume_text)
-    jd_skills = extract_skills_from_jd(jd_text)
-    
-    # Calculate match score
-    score, matched, missing = calculate_match_score(resume_skills, jd_skills)
-    
-    # Generate reasons
-    reasons = generate_match_reasons(matched, missing, score)
-    
-    return {
-        'match_score': round(score, 2),
-        'resume_skills': resume_skills,
-        'jd_skills': jd_skills,
-        'matched_skills': matched,
-        'missing_skills': missing,
-        'reasons': reasons,
-        'resume_skills_count': len(resume_skills),
-        'jd_skills_count': len(jd_skills),
-        'matched_count': len(matched)
-    }
+class MatchResult(Mapping):
+    """Compact result of matching one resume against one JobProfile.
+
+    Holds only skill IDs, the score and references to shared objects; the
+    skill-name lists and reasons are built from them each time they are
+    read, so the many results of a large cross-product that are never
+    displayed cost a few slots each. Reads like the old result dict
+    (result['reasons'], dict(result)) and to_dict() returns one.
+
+    When the matched count comes from a bulk sparse product (skill_matrix),
+    `matched_ids` is passed as None with `matched_count`, and the IDs are
+    only looked up if skill lists or reasons are read.
+    """
+
+    __slots__ = ('resume_ids', 'profile', 'score', 'match_score', 'extra', '_matched_ids', '_matched_count',
+                 '_scorers', '_keys')
+
+    _FIELDS = ('match_score', 'resume_skills', 'jd_skills', 'matched_skills', 'missing_skills', 'reasons',
+               'resume_skills_count', 'jd_skills_count', 'matched_count')
+
+    def __init__(self, resume_ids, profile, matched_ids, score, matched_count=None):
+        self.resume_ids = resume_ids
+        self.profile = profile
+        self._matched_ids = matched_ids
+        self._matched_count = len(matched_ids) if matched_ids is not None else matched_count
+        self.score = score  # unrounded
+        self.match_score = round(score, 2)
+        self.extra = None  # score columns added by rescore_match_result
+        self._scorers = ()
+        self._keys = None
+
+    @property
+    def matched_ids(self):
+        if self._matched_ids is None:
+            resume_ids = self.resume_ids
+            self._matched_ids = tuple(skill_id for skill_id in self.profile.skill_ids if skill_id in resume_ids)
+        return self._matched_ids
+
+    @property
+    def resume_skills(self):
+        return get_taxonomy().to_names(self.resume_ids)
+
+    @property
+    def jd_skills(self):
+        return list(self.profile.skills)
+
+    @property
+    def matched_skills(self):
+        return get_taxonomy().to_names(self.matched_ids)
+
+    @property
+    def missing_skills(self):
+        matched = set(self.matched_ids)
+        return get_taxonomy().to_names([i for i in self.profile.skill_ids if i not in matched])
+
+    @property
+    def reasons(self):
+        reasons = generate_match_reasons(self.matched_skills, self.missing_skills, self.score)
+        if not self._scorers:
+            return reasons
+        notes = [scorer.reason(*self._keys) for scorer in self._scorers]
+        return reasons[:-1] + notes + reasons[-1:]
+
+    @property
+    def resume_skills_count(self):
+        return len(self.resume_ids)
+
+    @property
+    def jd_skills_count(self):
+        return len(self.profile.skill_ids)
+
+    @property
+    def matched_count(self):
+        return self._matched_count
+
+    def rescored(self, score, scorers, resume_key, jd_key):
+        """Replace the score; the scorers' reasons are added when reasons are read"""
+        self.score = score
+        self.match_score = round(score, 2)
+        self._scorers = tuple(scorers)
+        self._keys = (resume_key, jd_key)
+
+    def __getitem__(self, key):
+        if key in self._FIELDS:
+            return getattr(self, key)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == 'match_score':
+            self.match_score = value
+        elif key in self._FIELDS:
+            raise KeyError(f"{key!r} is derived from the skill IDs and cannot be set")
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __iter__(self):
+        yield from self._FIELDS
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self):
+        return len(self._FIELDS) + (len(self.extra) if self.extra is not None else 0)
+
+    def to_dict(self):
+        """The result as a plain dict, with every list and reason built"""
+        return {key: self[key] for key in self}
+
+    def __repr__(self):
+        return f"MatchResult(match_score={self.match_score}, matched={self.matched_count}/{self.jd_skills_count})"
+
+@metrics.timed('match')
+def match_skill_ids_to_profile(resume_ids, profile):
+    """Score a resume's skill IDs against a parsed JobProfile"""
+    # Only IDs are kept; names and reasons are built on access
+    matched = tuple(skill_id for skill_id in profile.skill_ids if skill_id in resume_ids)
+    score = (len(matched) / len(profile.skill_ids)) * 100 if profile.skill_ids else 0
+    return MatchResult(resume_ids, profile, matched, score)
+
+@metrics.timed('rescore')
+def rescore_match_result(match_result, scorers, resume_key, jd_key):
+    """Re-score a keyword match result with alternative scorers, applied in order.
+
+    Each scorer (LexicalScorer, SemanticScorer) maps the running unrounded
+    score to a new one and records its own score column; its reason is
+    added when the result's reasons are read. The keyword score is kept
+    as 'keyword_score'.
+    """
+    if not scorers:
+        return match_result
+    
+    score = match_result.score
+    for scorer in scorers:
+        score = scorer.rescore(score, resume_key, jd_key)
+        match_result[scorer.score_column] = scorer.component_score(resume_key, jd_key)
+    
+    match_result['keyword_score'] = match_result.match_score
+    match_result.rescored(score, scorers, resume_key, jd_key)
+    return match_result
+
+def match_resume_to_profile(resume_text, profile):
+    """Match a single resume against an already parsed JobProfile"""
+    return match_skill_ids_to_profile(extract_skill_ids_from_resume(resume_text), profile)
+
+def match_resumes_to_jd(resumes, profile):
+    """Match many resumes against one JD, parsing the JD only once.
+
+    Each resume is either its text or a set of skill IDs already extracted
+    with extract_skill_ids_from_resume. `profile` is a JobProfile, or raw
+    JD text which is parsed once here. Returns one MatchResult per resume,
+    in input order.
+    """
+    if not isinstance(profile, JobProfile):
+        profile = JobProfile.from_text(profile)
+    
+    results = []
+    for resume in resumes:
+        if isinstance(resume, str):
+            results.append(match_resume_to_profile(resume, profile))
+        else:
+            results.append(match_skill_ids_to_profile(resume, profile))
+    return results
+
+def match_resume_to_jd(resume_text, jd_text, scorer='keyword', index=None):
+    """Main function to match a resume against a job description.
+
+    `scorer` is 'keyword' (share of the JD's taxonomy skills found), or
+    'bm25' / 'tfidf' for lexical relevance over the full text. Lexical
+    scores need term statistics from a resume corpus, so those scorers
+    take `index`, a LexicalIndex of the same method built over it (the
+    resume does not have to be in it).
+    """
+    if scorer not in SCORERS:
+        raise ValueError(f"Unknown scorer {scorer!r}, expected one of {SCORERS}")
+    if scorer != 'keyword' and (index is None or index.method != scorer):
+        raise ValueError(f"The {scorer!r} scorer needs a LexicalIndex(method={scorer!r}) over the resume corpus")
+    result = match_resumes_to_jd([resume_text], jd_text)[0]
+    if scorer == 'keyword':
+        return result
+    
+    return rescore_match_result(result, [DocumentLexicalScorer(index, resume_text, jd_text)], 'resume', 'jd')
 
 if __name__ == "__main__":
     # Test the matcher
@@ -110,7 +288,16 @@ if __name__ == "__main__":
     - MongoDB knowledge
     """
     
+    other_resumes = [
+        "Java developer. Skills: Java, Spring, Hibernate, Oracle, Jenkins, Maven",
+        "Data analyst working in Python and SQL with Tableau dashboards and Excel reports",
+        "Frontend engineer: JavaScript, React, TypeScript, CSS and Node.js services on AWS",
+    ]
+    
     result = match_resume_to_jd(test_resume, test_jd)
+    # BM25 term statistics come from the resume corpus
+    bm25 = match_resume_to_jd(test_resume, test_jd, scorer='bm25',
+                              index=LexicalIndex([test_resume] + other_resumes, method='bm25'))
     
     print("=== MATCHER TEST RESULTS ===")
     print(f"Match Score: {result['match_score']}%")
@@ -121,3 +308,4 @@ if __name__ == "__main__":
     print("Reasons:")
     for reason in result['reasons']:
         print(f"  - {reason}")
+    print(f"BM25 Score: {bm25['match_score']}%")
@@ -0,0 +1,314 @@
+import bisect
+import cProfile
+import functools
+import heapq
+import io
+import json
+import os
+import pstats
+import time
+from contextlib import contextmanager, nullcontext
+
+# Upper bounds (seconds) of the per-file latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+DEFAULT_SLOWEST = 20
+PROFILERS = ('cprofile', 'pyinstrument')
+PROMETHEUS_PREFIX = 'resume_matcher'
+
+# The active Metrics, or None while instrumentation is off. Every hook
+# checks this one global first, so disabled instrumentation costs a
+# function call and a comparison.
+_active = None
+_OFF = nullcontext()
+
+
+class Metrics:
+    """Stage timers, counters, cache hit rates and per-file latencies for one run.
+
+    Plain dicts and lists only, so a worker process can send its Metrics
+    back to the parent, which folds it in with merge().
+    """
+
+    def __init__(self, slowest=DEFAULT_SLOWEST):
+        self.slowest = slowest
+        self.stages = {}        # stage -> [calls, total seconds, max seconds]
+        self.counters = {}      # (name, ((label, value), ...)) -> value
+        self.caches = {}        # cache -> [hits, misses]
+        self.histograms = {}    # file format -> [bucket counts, count, sum]
+        self.slowest_files = []  # min-heap of (seconds, path)
+
+    def add_time(self, stage, seconds):
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [1, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def count(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def record_cache(self, cache, hits, misses):
+        entry = self.caches.setdefault(cache, [0, 0])
+        entry[0] += hits
+        entry[1] += misses
+
+    def observe_file(self, path, seconds, size=None):
+        """Record one file's parse latency, size and format"""
+        fmt = os.path.splitext(path)[1].lstrip('.').lower() or 'unknown'
+        self.count('documents_total', format=fmt)
+        if size is not None:
+            self.count('bytes_total', size, format=fmt)
+
+        histogram = self.histograms.get(fmt)
+        if histogram is None:
+            histogram = self.histograms[fmt] = [[0] * len(LATENCY_BUCKETS), 0, 0.0]
+        histogram[0][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        histogram[1] += 1
+        histogram[2] += seconds
+
+        if len(self.slowest_files) < self.slowest:
+            heapq.heappush(self.slowest_files, (seconds, path))
+        elif seconds > self.slowest_files[0][0]:
+            heapq.heapreplace(self.slowest_files, (seconds, path))
+
+    def merge(self, other):
+        """Fold another Metrics (e.g. from a worker process) into this one"""
+        for stage, (calls, total, peak) in other.stages.items():
+            entry = self.stages.setdefault(stage, [0, 0.0, 0.0])
+            entry[0] += calls
+            entry[1] += total
+            entry[2] = max(entry[2], peak)
+        for key, value in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+        for cache, (hits, misses) in other.caches.items():
+            self.record_cache(cache, hits, misses)
+        for fmt, (buckets, count, total) in other.histograms.items():
+            histogram = self.histograms.setdefault(fmt, [[0] * len(LATENCY_BUCKETS), 0, 0.0])
+            histogram[0] = [a + b for a, b in zip(histogram[0], buckets)]
+            histogram[1] += count
+            histogram[2] += total
+        for seconds, path in other.slowest_files:
+            if len(self.slowest_files) < self.slowest:
+                heapq.heappush(self.slowest_files, (seconds, path))
+            elif seconds > self.slowest_files[0][0]:
+                heapq.heapreplace(self.slowest_files, (seconds, path))
+
+    def slowest_paths(self, n=None):
+        """Paths of the slowest files, slowest first"""
+        ranked = sorted(self.slowest_files, reverse=True)
+        return [path for _, path in ranked[:n]]
+
+    def report(self):
+        """JSON-serialisable summary of everything collected"""
+        def bucket_label(bound):
+            return '+Inf' if bound == float('inf') else repr(bound)
+
+        histograms = {}
+        for fmt, (buckets, count, total) in sorted(self.histograms.items()):
+            cumulative = 0
+            counts = {}
+            for bound, bucket in zip(LATENCY_BUCKETS, buckets):
+                cumulative += bucket
+                counts[bucket_label(bound)] = cumulative
+            histograms[fmt] = {'count': count, 'sum_s': total, 'mean_s': total / count if count else 0.0,
+                               'buckets': counts}
+
+        return {
+            'stages': {stage: {'calls': calls, 'total_s': total, 'mean_s': total / calls, 'max_s': peak}
+                       for stage, (calls, total, peak) in sorted(self.stages.items())},
+            'counters': [{'name': name, 'labels': dict(labels), 'value': value}
+                         for (name, labels), value in sorted(self.counters.items())],
+            'caches': {cache: {'hits': hits, 'misses': misses,
+                               'hit_rate': hits / (hits + misses) if hits + misses else None}
+                       for cache, (hits, misses) in sorted(self.caches.items())},
+            'file_latency': histograms,
+            'slowest_files': [{'file': path, 'seconds': seconds}
+                              for seconds, path in sorted(self.slowest_files, reverse=True)],
+        }
+
+    def write_json(self, path):
+        _make_parent(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def prometheus_text(self, prefix=PROMETHEUS_PREFIX):
+        """The collected metrics in the Prometheus text exposition format"""
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            if not samples:
+                return
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ','.join(f'{key}="{_escape_label(val)}"' for key, val in labels)
+                lines.append(f"{prefix}_{name}{suffix}{{{label_text}}} {value}" if label_text
+                             else f"{prefix}_{name}{suffix} {value}")
+
+        stages = sorted(self.stages.items())
+        family('stage_seconds_total', 'counter', "Wall time spent in each pipeline stage",
+               [('', [('stage', stage)], total) for stage, (_, total, _) in stages])
+        family('stage_calls_total', 'counter', "Number of times each stage ran",
+               [('', [('stage', stage)], calls) for stage, (calls, _, _) in stages])
+
+        by_name = {}
+        for (name, labels), value in sorted(self.counters.items()):
+            by_name.setdefault(name, []).append(('', list(labels), value))
+        for name, samples in by_name.items():
+            family(name, 'counter', name.replace('_', ' '), samples)
+
+        caches = sorted(self.caches.items())
+        family('cache_hits_total', 'counter', "Cache lookups that found an entry",
+               [('', [('cache', cache)], hits) for cache, (hits, _) in caches])
+        family('cache_misses_total', 'counter', "Cache lookups that missed",
+               [('', [('cache', cache)], misses) for cache, (_, misses) in caches])
+
+        samples = []
+        for fmt, summary in self.report()['file_latency'].items():
+            for bound, count in summary['buckets'].items():
+                samples.append(('_bucket', [('format', fmt), ('le', bound)], count))
+            samples.append(('_sum', [('format', fmt)], summary['sum_s']))
+            samples.append(('_count', [('format', fmt)], summary['count']))
+        family('file_latency_seconds', 'histogram', "Per-file parse latency", samples)
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        _make_parent(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _make_parent(path):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+
+def enable(slowest=DEFAULT_SLOWEST):
+    """Start collecting into a fresh Metrics and return it"""
+    global _active
+    _active = Metrics(slowest=slowest)
+    return _active
+
+
+def disable():
+    """Stop collecting; returns the Metrics that was active (or None)"""
+    global _active
+    collected, _active = _active, None
+    return collected
+
+
+def active():
+    return _active
+
+
+def drain():
+    """Return what has been collected so far and start over (None when off)"""
+    global _active
+    if _active is None:
+        return None
+    collected, _active = _active, Metrics(slowest=_active.slowest)
+    return collected
+
+
+def timed(stage):
+    """Decorator adding each call's wall time to `stage` while instrumentation is on"""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            metrics = _active
+            if metrics is None:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                metrics.add_time(stage, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def count(name, value=1, **labels):
+    if _active is not None:
+        _active.count(name, value, **labels)
+
+
+def record_cache(cache, stats):
+    """Record hits and misses from a cache's stats() dict"""
+    if _active is not None:
+        _active.record_cache(cache, stats['hits'], stats['misses'])
+
+
+def merge(other):
+    if _active is not None and other is not None:
+        _active.merge(other)
+
+
+@contextmanager
+def _file_timer(metrics, path):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        try:
+            size = os.path.getsize(path)
+        except (OSError, TypeError):
+            size = None
+        metrics.observe_file(os.fspath(path) if isinstance(path, (str, os.PathLike)) else str(path), seconds, size)
+
+
+def file_timer(path):
+    """Context manager recording one file's latency (a shared no-op when off)"""
+    if _active is None:
+        return _OFF
+    return _file_timer(_active, path)
+
+
+def profile_files(paths, function, output_dir, profiler='cprofile', top=25):
+    """Run `function(path)` for each path under a profiler and write one report per file.
+
+    cProfile writes <name>.prof (for snakeviz or pstats) plus a
+    <name>.txt summary sorted by cumulative time; pyinstrument writes
+    <name>.html. Returns the written report paths.
+    """
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler {profiler!r}, expected one of {PROFILERS}")
+    if profiler == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("pyinstrument is not installed: pip install pyinstrument")
+            return []
+
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    for rank, path in enumerate(paths, 1):
+        name = f"{rank:02d}_{os.path.basename(path)}"
+        if profiler == 'cprofile':
+            profile = cProfile.Profile()
+            profile.runcall(function, path)
+            report_path = os.path.join(output_dir, name + '.prof')
+            profile.dump_stats(report_path)
+            summary = io.StringIO()
+            pstats.Stats(profile, stream=summary).sort_stats('cumulative').print_stats(top)
+            with open(os.path.join(output_dir, name + '.txt'), 'w', encoding='utf-8') as f:
+                f.write(summary.getvalue())
+        else:
+            profile = Profiler()
+            profile.start()
+            try:
+                function(path)
+            finally:
+                profile.stop()
+            report_path = os.path.join(output_dir, name + '.html')
+            with open(report_path, 'w', encoding='utf-8') as f:
+                f.write(profile.output_html())
+        written.append(report_path)
+    return written
@@ -0,0 +1,30 @@
+import threading
+
+# Process-wide store of loaded models. Forked workers get a copy of this
+# dict, so anything loaded in the parent before forking is inherited
+# rather than loaded again.
+_models = {}
+_lock = threading.Lock()
+
+
+def get_model(key, loader):
+    """Return the model registered under `key`, calling `loader()` on first use only"""
+    try:
+        return _models[key]
+    except KeyError:
+        pass
+
+    with _lock:
+        if key not in _models:
+            _models[key] = loader()
+        return _models[key]
+
+
+def is_loaded(key):
+    return key in _models
+
+
+def unload(key):
+    """Forget a loaded model, e.g. to free memory or force a reload"""
+    with _lock:
+        _models.pop(key, None)
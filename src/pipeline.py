@@ -0,0 +1,654 @@
+import inspect
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+import contact_extractor
+import metrics
+import simple_parser
+import skill_matcher
+import taxonomy
+import text_decoding
+from incremental import DEFAULT_MANIFEST_PATH, IncrementalRun
+from feature_cache import DEFAULT_CACHE_PATH, DEFAULT_MAX_BYTES, FeatureCache, code_fingerprint, file_content_hash
+from matcher import SCORERS, JobProfile, MatchResult, extract_skill_ids_from_resume, rescore_match_result
+from ranking import TopK
+from lexical import lexical_scorer
+from result_writer import (DEFAULT_ROW_GROUP_SIZE, OUTPUT_FORMATS, SKILL_COLUMNS, default_output_path,
+                           open_result_writer, parquet_available)
+from semantic import (DEFAULT_MODEL_PATH, DEFAULT_EMBEDDING_CACHE_PATH, DEFAULT_ENCODE_BATCH_SIZE,
+                      DEFAULT_SEMANTIC_WEIGHT, EmbeddingCache, SemanticEncoder, embed_records, semantic_scorer)
+from skill_index import SkillIndex, sync_skill_index
+from skill_matrix import jd_columns
+from vector_index import RETRAIN_DRIFT, VectorIndex, update_vector_index
+
+DEFAULT_CHUNKSIZE = 32
+DEFAULT_PROFILE_DIR = os.path.join("output", "profiles")
+
+@contextmanager
+def stage_timer(stage, timings=None):
+    """Time a pipeline stage, print the result and optionally store it in `timings`"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if timings is not None:
+            timings[stage] = elapsed
+        if metrics.active() is not None:
+            metrics.active().add_time(stage, elapsed)
+        print(f"[timing] {stage}: {elapsed:.3f}s")
+
+def add_ingest_arguments(parser):
+    """Register the ingest options (feature cache, worker pool) shared by the batch CLIs"""
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH,
+                        help=f"feature cache file (default: {DEFAULT_CACHE_PATH})")
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="evict least recently used entries beyond this size")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="always re-extract every resume")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes used to extract resumes (default: 1, sequential)")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                        help=f"resumes sent to a worker at a time (default: {DEFAULT_CHUNKSIZE})")
+    parser.add_argument('--index', metavar='PATH',
+                        help="keep a persistent skill index of the ingested resumes at PATH (.npz)")
+    parser.add_argument('--max-pdf-pages', type=int, metavar='N',
+                        help="parse at most the first N pages of each PDF (default: all)")
+    parser.add_argument('--max-chars', type=int, metavar='N',
+                        help="keep at most N characters of each resume's text (default: all)")
+
+def add_ranking_arguments(parser):
+    """Register the top-K ranking options shared by the batch CLIs"""
+    parser.add_argument('--top-k', type=int, metavar='K',
+                        help="keep only the K best resumes per JD (default: all)")
+    parser.add_argument('--min-score', type=float, metavar='SCORE',
+                        help="drop matches scoring below SCORE percent")
+    parser.add_argument('--scorer', choices=SCORERS, default='keyword',
+                        help="keyword: share of JD skills found; bm25 / tfidf: lexical relevance "
+                             "over the full resume text (default: keyword)")
+
+def add_incremental_arguments(parser):
+    """Register the incremental / watch options shared by the batch CLIs"""
+    parser.add_argument('--incremental', action='store_true',
+                        help="only process resumes and JDs added or changed since the last run")
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST_PATH,
+                        help=f"file state from the last incremental run (default: {DEFAULT_MANIFEST_PATH})")
+    parser.add_argument('--watch', type=float, nargs='?', const=5.0, metavar='SECONDS',
+                        help="keep running incrementally, polling for changes every SECONDS (default: 5)")
+
+def add_semantic_arguments(parser):
+    """Register the embedding-based scoring options shared by the batch CLIs"""
+    parser.add_argument('--semantic', action='store_true',
+                        help="blend sentence-embedding similarity into the keyword score")
+    parser.add_argument('--semantic-model', default=DEFAULT_MODEL_PATH, metavar='PATH',
+                        help=f"local sentence-transformers model directory (default: {DEFAULT_MODEL_PATH})")
+    parser.add_argument('--semantic-weight', type=float, default=DEFAULT_SEMANTIC_WEIGHT, metavar='W',
+                        help=f"share of the final score from semantic similarity (default: {DEFAULT_SEMANTIC_WEIGHT})")
+    parser.add_argument('--embedding-cache', default=DEFAULT_EMBEDDING_CACHE_PATH,
+                        help=f"embedding cache file (default: {DEFAULT_EMBEDDING_CACHE_PATH})")
+    parser.add_argument('--encode-batch-size', type=int, default=DEFAULT_ENCODE_BATCH_SIZE,
+                        help=f"sections per encoder batch (default: {DEFAULT_ENCODE_BATCH_SIZE})")
+    parser.add_argument('--vector-index', metavar='DIR',
+                        help="keep a quantized vector index of the resume embeddings in DIR")
+    parser.add_argument('--vector-precision', choices=('int8', 'fp16'), default='int8',
+                        help="storage precision of the vector index (default: int8)")
+    parser.add_argument('--retrain-vector-index', action='store_true',
+                        help="retrain the vector index lists instead of adding new resumes to them (done "
+                             f"automatically once {RETRAIN_DRIFT:.0%} of the index has changed since training)")
+
+def add_output_arguments(parser):
+    """Register the result output options shared by the batch CLIs"""
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS, default='csv',
+                        help="csv: one CSV sorted by score, built in memory (default); csv-stream, ndjson, "
+                             "parquet: rows streamed to disk as they are scored, in bounded memory "
+                             "(parquet is partitioned by JD); streamed rows are not printed")
+    parser.add_argument('--output', metavar='PATH',
+                        help="result file, or dataset directory for parquet (default: in output/)")
+    parser.add_argument('--row-group-size', type=int, default=DEFAULT_ROW_GROUP_SIZE, metavar='ROWS',
+                        help=f"rows per Parquet row group (default: {DEFAULT_ROW_GROUP_SIZE})")
+    parser.add_argument('--reasons', action='store_true',
+                        help="add the reasons column to streamed output (the csv format always has it); "
+                             "formatting it for every row is slow on large batches")
+
+def check_output_arguments(args):
+    """Why the selected output cannot be written, or None"""
+    if args.output_format != 'csv' and (args.incremental or args.watch is not None):
+        return "--incremental and --watch merge into the previous CSV; use --output-format csv"
+    if args.output_format == 'parquet' and not parquet_available():
+        return "Parquet output needs pyarrow: pip install pyarrow"
+    return None
+
+def add_metrics_arguments(parser):
+    """Register the instrumentation options shared by the batch CLIs"""
+    parser.add_argument('--metrics', metavar='PATH',
+                        help="write per-stage timings, counters, cache hit rates and latency histograms "
+                             "to PATH (JSON)")
+    parser.add_argument('--metrics-prom', metavar='PATH',
+                        help="also write the metrics in Prometheus text format (default with --metrics: "
+                             "PATH with a .prom suffix)")
+    parser.add_argument('--profile-slowest', type=int, default=0, metavar='N',
+                        help="after the run, profile extraction of the N slowest files")
+    parser.add_argument('--profiler', choices=metrics.PROFILERS, default='cprofile',
+                        help="profiler used by --profile-slowest (default: cprofile)")
+    parser.add_argument('--profile-dir', default=DEFAULT_PROFILE_DIR,
+                        help=f"where --profile-slowest writes its reports (default: {DEFAULT_PROFILE_DIR})")
+
+@contextmanager
+def metrics_session(args, extract_text, extract_fields):
+    """Collect metrics for one run when asked to on the command line, then write the reports.
+
+    Instrumentation stays off (and nearly free) unless --metrics,
+    --metrics-prom or --profile-slowest is given.
+    """
+    if not (args.metrics or args.metrics_prom or args.profile_slowest):
+        yield None
+        return
+
+    collected = metrics.enable(slowest=max(args.profile_slowest, metrics.DEFAULT_SLOWEST))
+    try:
+        yield collected
+    finally:
+        metrics.disable()
+        prometheus_path = args.metrics_prom or (os.path.splitext(args.metrics)[0] + '.prom' if args.metrics else None)
+        if args.metrics:
+            collected.write_json(args.metrics)
+            print(f"Metrics written to {args.metrics}")
+        if prometheus_path:
+            collected.write_prometheus(prometheus_path)
+            print(f"Prometheus metrics written to {prometheus_path}")
+        slowest = collected.slowest_paths(args.profile_slowest) if args.profile_slowest else []
+        if slowest:
+            extract_text = budgeted_extractor(args, extract_text)
+            reports = metrics.profile_files(slowest, partial(extract_record, extract_text=extract_text,
+                                                             extract_fields=extract_fields),
+                                            args.profile_dir, profiler=args.profiler)
+            print(f"Profiled the {len(slowest)} slowest files into {args.profile_dir} ({len(reports)} reports)")
+
+def open_encoder(args):
+    """SemanticEncoder selected on the command line, or None without --semantic"""
+    if not args.semantic:
+        return None
+    cache = None if args.no_cache else EmbeddingCache(args.embedding_cache,
+                                                      max_bytes=args.cache_max_mb * 1024 * 1024)
+    return SemanticEncoder(args.semantic_model, cache=cache, batch_size=args.encode_batch_size)
+
+def open_cache(args):
+    """Open the feature cache selected on the command line, or None if disabled"""
+    if args.no_cache:
+        return None
+    return FeatureCache(args.cache, max_bytes=args.cache_max_mb * 1024 * 1024)
+
+def budgeted_extractor(args, extract_text):
+    """`extract_text` bound to the --max-pdf-pages / --max-chars budgets, if any were given"""
+    if args.max_pdf_pages is None and args.max_chars is None:
+        return extract_text
+    return partial(extract_text, max_pages=args.max_pdf_pages, max_chars=args.max_chars)
+
+def extractor_version(extract_text, extract_fields):
+    """Cache version for an ingest configuration.
+
+    Covers the source of the text and field extractors, the shared parser,
+    text decoding, contact extraction and skill matching code, the taxonomy
+    file and, when the field module exposes model_version(), the installed
+    NER model. Budgets bound with budgeted_extractor are part of it too.
+    """
+    budget = extract_text.keywords if isinstance(extract_text, partial) else {}
+    extract_text = getattr(extract_text, 'func', extract_text)
+    parts = [
+        f"{extract_text.__module__}.{extract_text.__qualname__}",
+        f"{extract_fields.__module__}.{extract_fields.__qualname__}",
+        repr(sorted(budget.items())),
+        inspect.getsourcefile(extract_text),
+        inspect.getsourcefile(extract_fields),
+        simple_parser.__file__,
+        text_decoding.__file__,
+        contact_extractor.__file__,
+        skill_matcher.__file__,
+        taxonomy.__file__,
+        taxonomy.DEFAULT_TAXONOMY_PATH,
+    ]
+    fields_module = sys.modules.get(extract_fields.__module__)
+    if hasattr(fields_module, 'model_version'):
+        parts.append(fields_module.model_version())
+    return code_fingerprint(*parts)
+
+def extract_chunk(resume_paths, extract_text, extract_fields, extract_fields_batch=None):
+    """Parse a chunk of resumes into feature records (None where a file has no text).
+
+    When `extract_fields_batch` is given, field extraction for the whole
+    chunk goes through it in one call, e.g. to stream texts through
+    nlp.pipe instead of running the model once per document.
+    """
+    texts = []
+    for resume_path in resume_paths:
+        with metrics.file_timer(resume_path):
+            texts.append(extract_text(resume_path))
+    readable = [i for i, text in enumerate(texts) if text]
+
+    if extract_fields_batch is not None:
+        fields = extract_fields_batch([texts[i] for i in readable])
+    else:
+        fields = [extract_fields(texts[i]) for i in readable]
+
+    records = [None] * len(resume_paths)
+    for i, record_fields in zip(readable, fields):
+        records[i] = {
+            'resume_file': os.path.basename(resume_paths[i]),
+            'text': texts[i],
+            'fields': record_fields,
+            'skill_ids': extract_skill_ids_from_resume(texts[i])
+        }
+    return records
+
+def extract_upload(file_name, content, extract_fields=simple_parser.extract_basic_fields,
+                   max_pages=simple_parser.UPLOAD_MAX_PDF_PAGES, max_chars=simple_parser.UPLOAD_MAX_CHARS):
+    """Parse an in-memory upload into a feature record, or return None if it has no text.
+
+    `content` is the file's bytes; the type is taken from `file_name`.
+    Extraction stops at the upload budgets by default. Module-level so it
+    can run on a process pool.
+    """
+    text = simple_parser.extract_document_text(content, file_name, max_pages=max_pages, max_chars=max_chars)
+    
+    if not text:
+        return None
+    return {
+        'resume_file': file_name,
+        'text': text,
+        'fields': extract_fields(text),
+        'skill_ids': extract_skill_ids_from_resume(text)
+    }
+
+def extract_record(resume_path, extract_text, extract_fields):
+    """Parse one resume into a feature record, or return None if it has no text"""
+    return extract_chunk([resume_path], extract_text, extract_fields)[0]
+
+def _record_from_cache(resume_path, cached):
+    if not cached['text']:
+        return None
+    return {
+        'resume_file': os.path.basename(resume_path),
+        'text': cached['text'],
+        'fields': cached['fields'],
+        'skill_ids': frozenset(cached['skill_ids'])
+    }
+
+def _store_in_cache(cache, digest, cache_version, record):
+    # Unreadable files are cached too, so they are not re-parsed every run
+    cache.put(digest, cache_version, {
+        'text': record['text'] if record else '',
+        'fields': record['fields'] if record else {},
+        'skill_ids': sorted(record['skill_ids']) if record else []
+    })
+
+def ingest_resume(resume_path, extract_text, extract_fields, cache=None, cache_version=None):
+    """Parse one resume into a feature record, or return None if it has no text.
+
+    The record holds everything the scoring stage needs, so each file is
+    read, parsed and skill-scanned exactly once per run. With a FeatureCache,
+    files whose content was already processed by the same code skip
+    extraction entirely.
+    """
+    if cache is None:
+        return extract_record(resume_path, extract_text, extract_fields)
+
+    if cache_version is None:
+        cache_version = extractor_version(extract_text, extract_fields)
+    digest = file_content_hash(resume_path)
+    cached = cache.get(digest, cache_version)
+    if cached is not None:
+        return _record_from_cache(resume_path, cached)
+
+    record = extract_record(resume_path, extract_text, extract_fields)
+    _store_in_cache(cache, digest, cache_version, record)
+    return record
+
+# Extractors for the current worker process, set once by _init_worker
+_worker_extractors = None
+
+def _init_worker(extract_text, extract_fields, extract_fields_batch, warm_up, collect_metrics=False):
+    global _worker_extractors
+    _worker_extractors = (extract_text, extract_fields, extract_fields_batch)
+    if collect_metrics:
+        metrics.enable()
+    # A no-op when the model was inherited from the parent through fork
+    if warm_up is not None:
+        warm_up()
+
+def _extract_chunk_in_worker(resume_paths):
+    # Worker metrics travel back with each chunk and are merged by the parent
+    return extract_chunk(resume_paths, *_worker_extractors), metrics.drain()
+
+def extract_records(resume_paths, extract_text, extract_fields, workers=1, chunksize=DEFAULT_CHUNKSIZE,
+                    extract_fields_batch=None, warm_up=None):
+    """Yield a record (or None) per path, in input order.
+
+    Paths are processed in chunks of `chunksize`. With workers > 1 the
+    chunks are spread over a process pool and results stream back as each
+    chunk finishes. `warm_up` (e.g. advanced_parser.warm_up) runs in this
+    process before the pool starts, so forked workers inherit a loaded
+    model; workers started any other way run it once in their initializer.
+    """
+    chunks = [resume_paths[i:i + chunksize] for i in range(0, len(resume_paths), chunksize)]
+
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from extract_chunk(chunk, extract_text, extract_fields, extract_fields_batch)
+        return
+
+    workers = min(workers, len(chunks))
+    if warm_up is not None and multiprocessing.get_start_method() == 'fork':
+        warm_up()
+    initargs = (extract_text, extract_fields, extract_fields_batch, warm_up, metrics.active() is not None)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+        for chunk_records, worker_metrics in executor.map(_extract_chunk_in_worker, chunks):
+            metrics.merge(worker_metrics)
+            yield from chunk_records
+
+def ingest_resumes(resume_dir, resume_files, extract_text, extract_fields, cache=None,
+                   workers=1, chunksize=DEFAULT_CHUNKSIZE, extract_fields_batch=None, warm_up=None):
+    """Ingest stage: build one feature record per readable resume.
+
+    Cache lookups happen in this process; only misses are extracted, either
+    sequentially or on a pool of `workers` processes. Records come back in
+    `resume_files` order either way, so rankings do not depend on `workers`.
+    """
+    resume_paths = [os.path.join(resume_dir, resume_file) for resume_file in resume_files]
+    cache_version = extractor_version(extract_text, extract_fields) if cache is not None else None
+
+    records = [None] * len(resume_paths)
+    pending = []
+    digests = {}
+    for i, resume_path in enumerate(resume_paths):
+        if cache is not None:
+            digests[i] = file_content_hash(resume_path)
+            cached = cache.get(digests[i], cache_version)
+            if cached is not None:
+                records[i] = _record_from_cache(resume_path, cached)
+                continue
+        pending.append(i)
+
+    pending_paths = [resume_paths[i] for i in pending]
+    for i, record in zip(pending, extract_records(pending_paths, extract_text, extract_fields,
+                                                  workers=workers, chunksize=chunksize,
+                                                  extract_fields_batch=extract_fields_batch,
+                                                  warm_up=warm_up)):
+        records[i] = record
+        if cache is not None:
+            _store_in_cache(cache, digests[i], cache_version, record)
+
+    return [record for record in records if record is not None]
+
+def update_skill_index(index_path, records, removed=None):
+    """Update the persistent skill index at `index_path` with this run's records.
+
+    By default the index is synced to exactly `records`. Incremental runs
+    pass the deleted resume files as `removed` instead, so resumes that
+    were not re-ingested stay indexed. An index built with another taxonomy
+    is started afresh; the taxonomy is part of the incremental version, so
+    such a run re-ingests every resume. So does a run whose index path is
+    new or missing (see missing_indexes).
+    """
+    index = SkillIndex.open(index_path)
+    if removed is None:
+        sync_skill_index(index, records)
+    else:
+        for resume_file in removed:
+            index.remove(resume_file)
+        for record in records:
+            index.add(record['resume_file'], record['skill_ids'])
+    index.save(index_path)
+    return index
+
+def missing_indexes(args, encoder):
+    """Index paths enabled for this run that do not exist (deleted, or never built)"""
+    missing = []
+    if args.index and not os.path.exists(args.index):
+        missing.append(args.index)
+    if encoder is not None and args.vector_index and not os.path.exists(os.path.join(args.vector_index, 'meta.json')):
+        missing.append(args.vector_index)
+    return missing
+
+def read_job_descriptions(jd_dir, jd_files):
+    return [text_decoding.read_text(os.path.join(jd_dir, jd_file)) for jd_file in jd_files]
+
+def update_semantic_index(index_path, records, removed=None, precision='int8', model_id=None, retrain=False):
+    """Update the vector index at `index_path` with this run's embedded records.
+
+    As with update_skill_index, incremental runs pass `removed` so that
+    resumes not re-ingested this run keep their stored vectors; the new
+    vectors join the existing lists unless `retrain` is set (see
+    update_vector_index). Other runs rebuild the index from `records`, as
+    does an index built with another embedding model; the model is part of
+    the incremental version, so such a run re-embeds every resume. Returns
+    None when there is nothing to index.
+    """
+    index = VectorIndex.open(index_path, model_id) if removed is not None else None
+    if index is None and not records:
+        return None
+
+    keys = [record['resume_file'] for record in records]
+    vectors = np.vstack([record['embedding'] for record in records]) if records else np.empty((0, 0))
+    index = update_vector_index(index, keys, vectors, removed=removed or (), retrain=retrain,
+                                precision=precision, model_id=model_id)
+    index.save(index_path)
+    return index
+
+def load_job_profiles(jd_dir, jd_files):
+    """Read and parse every JD once; returns (texts, profiles), the texts for the full-text scorers"""
+    texts = read_job_descriptions(jd_dir, jd_files)
+    return texts, [JobProfile.from_text(text, name=jd_file) for jd_file, text in zip(jd_files, texts)]
+
+def _keyword_scores(matched, profile):
+    """Unrounded keyword scores for one JD's column of matched counts, as Python numbers"""
+    if not profile.skill_ids:
+        return [0] * len(matched)
+    return ((matched / len(profile.skill_ids)) * 100).tolist()
+
+def score_records(records, profiles, scorers=(), keep=None):
+    """Scoring stage: cross every ingested resume with every JD profile.
+
+    Matched counts and keyword scores come from the resume x skill matrix,
+    built once and read one JD column at a time (skill_matrix.jd_columns);
+    skill lists and reasons are only built for the results that are read.
+    `keep(resume file, JD name)`, if given, skips pairs before a result is
+    built. Yields (record, profile, match_result) grouped by JD, in input
+    order. `scorers` (LexicalScorer, SemanticScorer) replace or blend the
+    keyword score, in order.
+    """
+    columns = jd_columns([record['skill_ids'] for record in records], profiles)
+    for profile, matched in zip(profiles, columns):
+        scores = _keyword_scores(matched, profile)
+        matched = matched.tolist()
+        for i, record in enumerate(records):
+            if keep is not None and not keep(record['resume_file'], profile.name):
+                continue
+            match_result = MatchResult(record['skill_ids'], profile, None, scores[i], matched_count=matched[i])
+            rescore_match_result(match_result, scorers, record['resume_file'], profile.name)
+            yield record, profile, match_result
+
+def rank_records(records, profiles, k=None, min_score=None, scorers=(), keep=None):
+    """Scoring stage with a bounded top-K heap per JD.
+
+    Keyword scores come from the same per-JD matrix columns as
+    score_records and the scorers rescore them per pair; each JD keeps its
+    best K in a TopK heap, so memory stays O(K) per JD and a JD's results
+    are yielded as soon as its column is scored. Full match results (skill
+    lists and reasons) are built only for the kept records that pass
+    `keep`. Yields (record, profile, match_result) one JD at a time, best
+    first, ties broken by resume file name.
+    """
+    columns = jd_columns([record['skill_ids'] for record in records], profiles)
+    for profile, matched in zip(profiles, columns):
+        keyword_scores = _keyword_scores(matched, profile)
+        ranking = TopK(k, min_score)
+        for i, (record, score) in enumerate(zip(records, keyword_scores)):
+            for scorer in scorers:
+                score = scorer.rescore(score, record['resume_file'], profile.name)
+            ranking.push(score, record['resume_file'], i)
+        
+        for i in ranking.results():
+            record = records[i]
+            if keep is not None and not keep(record['resume_file'], profile.name):
+                continue
+            match_result = MatchResult(record['skill_ids'], profile, None, keyword_scores[i],
+                                       matched_count=int(matched[i]))
+            rescore_match_result(match_result, scorers, record['resume_file'], profile.name)
+            yield record, profile, match_result
+
+def run_pipeline(args, resume_files, jd_files, csv_path, extract_text, extract_fields, build_row, print_row,
+                 resume_dir="data/resumes", jd_dir="data/jds", extract_fields_batch=None, warm_up=None):
+    """One batch pass shared by the CLIs: ingest, index, score and write the results.
+
+    `build_row(record, profile, match_result)` returns a result row's base
+    columns (scorer columns are added here) and `print_row(row,
+    match_result)` reports it; streamed rows are not printed. `csv_path`
+    is where the default CSV output goes. Returns the DataFrame written to the CSV, or None when nothing
+    was written to one (streamed output, no changes, or an error).
+    """
+    problem = check_output_arguments(args)
+    if problem:
+        print(problem)
+        return None
+    output_path = args.output or default_output_path(args.output_format, csv_path)
+    extract_text = budgeted_extractor(args, extract_text)
+    
+    encoder = open_encoder(args)
+    
+    incremental = None
+    if args.incremental or args.watch is not None:
+        version = extractor_version(extract_text, extract_fields)
+        if args.scorer != 'keyword':
+            version += f":scorer={args.scorer}"
+        if encoder is not None:
+            version += f":semantic={encoder.model_id}:{args.semantic_weight}"
+        # Indexes only hold the resumes ingested while they were enabled
+        if args.index:
+            version += f":index={os.path.abspath(args.index)}"
+        if encoder is not None and args.vector_index:
+            version += f":vector-index={os.path.abspath(args.vector_index)}"
+        incremental = IncrementalRun(args.manifest, resume_dir, resume_files, jd_dir, jd_files, output_path,
+                                     version=version, top_k=args.top_k, min_score=args.min_score,
+                                     rescore_all=args.scorer != 'keyword')
+        missing = missing_indexes(args, encoder)
+        if not incremental.has_changes and not missing:
+            print("No changes since the last run")
+            incremental.commit()  # refresh mtimes of touched files
+            return None
+        print(f"Incremental run - {incremental.summary()}")
+        resume_files = incremental.resumes_to_ingest()
+        if missing:
+            print(f"{', '.join(missing)} not found; ingesting every resume to rebuild it")
+            resume_files = incremental.all_resumes
+    removed = incremental.resume_changes.removed if incremental is not None else None
+    
+    cache = open_cache(args)
+    
+    # Ingest stage: parse every resume exactly once
+    with stage_timer('ingest'):
+        records = ingest_resumes(resume_dir, resume_files, extract_text, extract_fields,
+                                 cache=cache, workers=args.workers, chunksize=args.chunksize,
+                                 extract_fields_batch=extract_fields_batch, warm_up=warm_up)
+        jd_texts, profiles = load_job_profiles(jd_dir, jd_files)
+        
+        scorers = []
+        if args.scorer != 'keyword':
+            # Term statistics and weighted resume vectors are built once, here
+            scorers.append(lexical_scorer(records, jd_texts, profiles, method=args.scorer))
+    
+    if args.index:
+        index = update_skill_index(args.index, records, removed=removed)
+        print(f"Skill index {args.index}: {len(index)} resumes")
+    
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Feature cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+        metrics.record_cache('features', stats)
+        cache.close()
+    
+    if encoder is not None:
+        # Resume embeddings are computed once here and reused for every JD
+        with stage_timer('embed'):
+            try:
+                embed_records(records, encoder)
+                scorers.append(semantic_scorer(records, jd_texts, profiles, encoder,
+                                               weight=args.semantic_weight))
+            except (ImportError, FileNotFoundError) as e:
+                print(f"Semantic scoring unavailable: {e}")
+                return None
+        if args.vector_index:
+            vectors = update_semantic_index(args.vector_index, records, removed=removed,
+                                            precision=args.vector_precision, model_id=encoder.model_id,
+                                            retrain=args.retrain_vector_index)
+            if vectors is not None:
+                print(f"Vector index {args.vector_index}: {len(vectors)} resumes in {vectors.n_lists} lists")
+        if encoder.cache is not None:
+            stats = encoder.cache.stats()
+            print(f"Embedding cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+            metrics.record_cache('embeddings', stats)
+            encoder.cache.close()
+    
+    # Scoring stage: cross every resume record with every JD
+    results = []
+    writer = None
+    
+    keep = incremental.needs_scoring if incremental is not None else None
+    # Reasons are formatted only for rows that keep them
+    with_reasons = args.output_format == 'csv' or args.reasons
+    if args.top_k is not None or args.min_score is not None:
+        # Bounded heap per JD; full results only for the kept resumes
+        scored = rank_records(records, profiles, k=args.top_k, min_score=args.min_score, scorers=scorers, keep=keep)
+    else:
+        scored = score_records(records, profiles, scorers=scorers, keep=keep)
+    
+    with stage_timer('scoring'):
+        for record, profile, match_result in scored:
+            result = build_row(record, profile, match_result)
+            if with_reasons:
+                result['reasons'] = ' | '.join(match_result['reasons'])
+            if scorers:
+                for column in ['keyword_score'] + [scorer.score_column for scorer in scorers]:
+                    result[column] = match_result[column]
+            if writer is None and args.output_format != 'csv':
+                # Columns follow the first row, plus the per-match skill lists
+                writer = open_result_writer(args.output_format, output_path, list(result) + list(SKILL_COLUMNS),
+                                            row_group_size=args.row_group_size)
+            if writer is not None:
+                # Streamed runs can be millions of rows: they go to the file, not the console
+                writer.write(dict(result, matched_skills=match_result['matched_skills'],
+                                  missing_skills=match_result['missing_skills']))
+            else:
+                results.append(result)
+                print_row(result, match_result)
+    
+    if args.output_format != 'csv':
+        if writer is not None:
+            writer.close()
+            print(f"\n=== {writer.rows} results streamed to {output_path} ===")
+        else:
+            print("\nNo results to save")
+        return None
+    
+    if incremental is not None:
+        # Fold this run's rows into the previous ranking
+        df = incremental.merge(results, top_k=args.top_k)
+    elif results:
+        df = pd.DataFrame(results)
+        df = df.sort_values('match_score', ascending=False)
+    else:
+        return None
+    
+    with stage_timer('write_csv'):
+        df.to_csv(output_path, index=False)
+    print(f"\n=== Results saved to {output_path} ===")
+    if incremental is not None:
+        incremental.commit()
+    return df
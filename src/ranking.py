@@ -0,0 +1,85 @@
+import heapq
+from functools import total_ordering
+
+
+@total_ordering
+class _Reversed:
+    """Invert the ordering of a tie-break key inside the min-heap"""
+
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+    def __lt__(self, other):
+        return self.key > other.key
+
+
+class TopK:
+    """Keep the K highest-scoring items seen so far in O(K) memory.
+
+    Ties on score are broken by `tiebreak` ascending (e.g. the resume file
+    name), so results do not depend on input order. Items scoring below
+    `min_score` are dropped immediately. k=None keeps every item that
+    passes the cutoff.
+    """
+
+    def __init__(self, k=None, min_score=None):
+        if k is not None and k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.min_score = min_score
+        self.seen = 0
+        # Min-heap whose root is the current worst entry
+        self._heap = []
+
+    def __len__(self):
+        return len(self._heap)
+
+    def _entry_key(self, score, tiebreak):
+        # Equal tie-break keys fall back to arrival order, earliest first
+        return (score, _Reversed((tiebreak, self.seen)))
+
+    def push(self, score, tiebreak, item):
+        """Offer an item; returns True if it is currently in the top K"""
+        self.seen += 1
+        if self.min_score is not None and score < self.min_score:
+            return False
+
+        full = self.k is not None and len(self._heap) >= self.k
+        if full and score < self._heap[0][0][0]:
+            # Cheap reject: lower than the current worst kept score
+            return False
+
+        key = self._entry_key(score, tiebreak)
+        if not full:
+            heapq.heappush(self._heap, (key, item))
+            return True
+        if key > self._heap[0][0]:
+            heapq.heapreplace(self._heap, (key, item))
+            return True
+        return False
+
+    def results(self):
+        """Kept items, best first"""
+        ordered = sorted(self._heap, key=lambda entry: entry[0], reverse=True)
+        return [item for _, item in ordered]
+
+
+def top_k_per_profile(records, profiles, score_fn, k=None, min_score=None):
+    """Yield (profile, [(record, score), ...]) with each JD's best records, one JD at a time.
+
+    `score_fn(record, profile)` should be cheap (no reasons or name lists);
+    only the kept records are returned, so callers build full match results
+    for at most K records per JD.
+    """
+    for profile in profiles:
+        ranking = TopK(k, min_score)
+        for record in records:
+            score = score_fn(record, profile)
+            ranking.push(score, record['resume_file'], (record, score))
+        yield profile, ranking.results()
+
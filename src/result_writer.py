@@ -0,0 +1,213 @@
+import csv
+import json
+import os
+import re
+import shutil
+
+OUTPUT_FORMATS = ('csv', 'csv-stream', 'ndjson', 'parquet')
+DEFAULT_ROW_GROUP_SIZE = 65536
+
+# Per-match skill lists; written by the streaming formats only, so the
+# default CSV keeps its columns
+SKILL_COLUMNS = ('matched_skills', 'missing_skills')
+INTEGER_COLUMNS = ('resume_skills_count', 'jd_skills_count', 'matched_skills_count')
+STRING_COLUMNS = ('resume_file', 'jd_file', 'candidate_name', 'email', 'phone', 'organizations', 'education',
+                  'reasons')
+
+
+class CsvResultWriter:
+    """Write result rows to a CSV file as they arrive.
+
+    Rows are not sorted: they come out in scoring order, one JD at a time
+    (best first per JD when ranking with --top-k / --min-score). Skill
+    lists are joined with ", ".
+    """
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.rows = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=list(columns), extrasaction='ignore')
+        self._writer.writeheader()
+
+    def write(self, row):
+        self._writer.writerow({key: ', '.join(value) if isinstance(value, (list, tuple)) else value
+                               for key, value in row.items()})
+        self.rows += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class NdjsonResultWriter:
+    """Write result rows as newline-delimited JSON, one object per line, in scoring order"""
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = list(columns)
+        self.rows = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, row):
+        self._file.write(json.dumps({column: row.get(column) for column in self.columns}, ensure_ascii=False))
+        self._file.write('\n')
+        self.rows += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def partition_name(jd_file):
+    """Directory name of a JD's partition (Hive style, so readers restore the jd_file column)"""
+    return 'jd_file=' + re.sub(r'[^\w.\-]', '_', jd_file)
+
+
+class ParquetResultWriter:
+    """Stream result rows into a Parquet dataset partitioned by JD.
+
+    `path` becomes a directory with one jd_file=<name>/part-0.parquet file
+    per JD. Rows are buffered and flushed as a row group every
+    `row_group_size` rows. The scoring stage yields one JD at a time, so
+    a JD's file is closed as soon as rows for the next JD arrive: at most
+    one row group and one open file are held however many results and
+    JDs there are. Skill lists are list<string>
+    columns; they and the other repetitive string columns are dictionary
+    encoded. The dataset is written next to `path` and swapped in on
+    close(), so readers never see a half-written result.
+
+    Read it back with pandas.read_parquet(path) or pyarrow.dataset.
+    """
+
+    def __init__(self, path, columns, row_group_size=DEFAULT_ROW_GROUP_SIZE, compression='zstd'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._pq = pq
+        self.path = path
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.rows = 0
+        # jd_file comes from the partition directory, not from the files
+        self.columns = [column for column in columns if column != 'jd_file']
+        self.schema = pa.schema([pa.field(column, self._column_type(column)) for column in self.columns])
+        # Parquet names list values by their leaf path
+        self._dictionary_columns = ([f"{column}.list.element" for column in self.columns if column in SKILL_COLUMNS] +
+                                    [column for column in self.columns if column in ('reasons', 'email', 'phone')])
+        self._buffer = {column: [] for column in self.columns}
+        self._writer = None
+        self._jd_file = None
+        # Files written per JD, in case rows for a finished JD arrive again
+        self._parts = {}
+
+        self._tmp_path = path.rstrip(os.sep) + '.tmp'
+        if os.path.exists(self._tmp_path):
+            shutil.rmtree(self._tmp_path)
+        os.makedirs(self._tmp_path)
+
+    def _column_type(self, column):
+        pa = self._pa
+        if column in SKILL_COLUMNS:
+            return pa.list_(pa.string())
+        if column in INTEGER_COLUMNS:
+            return pa.int32()
+        if column in STRING_COLUMNS:
+            return pa.string()
+        # match_score and the scorer columns (keyword_score, bm25_score, ...)
+        return pa.float64()
+
+    def write(self, row):
+        jd_file = row['jd_file']
+        if jd_file != self._jd_file:
+            self._close_partition()
+            self._jd_file = jd_file
+        buffer = self._buffer
+        for column in self.columns:
+            buffer[column].append(row.get(column))
+        self.rows += 1
+        if len(buffer[self.columns[0]]) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        buffer = self._buffer
+        if not buffer[self.columns[0]]:
+            return
+        if self._writer is None:
+            directory = os.path.join(self._tmp_path, partition_name(self._jd_file))
+            os.makedirs(directory, exist_ok=True)
+            part = self._parts.get(self._jd_file, 0)
+            self._parts[self._jd_file] = part + 1
+            self._writer = self._pq.ParquetWriter(
+                os.path.join(directory, f'part-{part}.parquet'), self.schema, compression=self.compression,
+                use_dictionary=self._dictionary_columns)
+        self._writer.write_table(self._pa.Table.from_pydict(buffer, schema=self.schema),
+                                 row_group_size=self.row_group_size)
+        for values in buffer.values():
+            values.clear()
+
+    def _close_partition(self):
+        """Flush and close the current JD's file"""
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def close(self):
+        self._close_partition()
+
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path)
+        elif os.path.exists(self.path):
+            os.remove(self.path)
+        os.replace(self._tmp_path, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def parquet_available():
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def open_result_writer(output_format, path, columns, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """Streaming writer for `output_format`; raises ImportError when Parquet needs pyarrow"""
+    if output_format == 'parquet':
+        return ParquetResultWriter(path, columns, row_group_size=row_group_size)
+    if output_format == 'ndjson':
+        return NdjsonResultWriter(path, columns)
+    if output_format == 'csv-stream':
+        return CsvResultWriter(path, columns)
+    raise ValueError(f"{output_format!r} is not a streaming output format")
+
+
+def default_output_path(output_format, csv_path):
+    """Where a format is written by default, next to the CLI's CSV output"""
+    stem = os.path.splitext(csv_path)[0]
+    if output_format == 'parquet':
+        return stem + '.parquet'
+    if output_format == 'ndjson':
+        return stem + '.ndjson'
+    return csv_path
@@ -0,0 +1,206 @@
+import os
+import re
+
+import numpy as np
+
+from feature_cache import FeatureCache, code_fingerprint, content_hash
+from model_registry import get_model
+
+# A local sentence-transformers model directory, e.g. created with
+# SentenceTransformer('all-MiniLM-L6-v2').save('models/all-MiniLM-L6-v2')
+DEFAULT_MODEL_PATH = os.environ.get("RESUME_MATCHER_MODEL", os.path.join("models", "all-MiniLM-L6-v2"))
+DEFAULT_EMBEDDING_CACHE_PATH = os.path.join("cache", "embeddings.sqlite")
+DEFAULT_ENCODE_BATCH_SIZE = 128
+DEFAULT_SEMANTIC_WEIGHT = 0.5
+
+# Longer sections are split; most encoders truncate at a few hundred tokens
+MAX_SECTION_CHARS = 1000
+
+
+def load_encoder(model_path=DEFAULT_MODEL_PATH):
+    """Load a sentence-transformers model from a local directory, on CPU, without network access"""
+    if not os.path.isdir(model_path):
+        raise FileNotFoundError(f"No sentence-transformers model at {model_path}; "
+                                f"save one there or set RESUME_MATCHER_MODEL")
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_path, device='cpu')
+
+
+def get_encoder(model_path=DEFAULT_MODEL_PATH):
+    """The process-wide encoder for `model_path`, loaded on first use"""
+    return get_model(("sentence-transformers", os.path.abspath(model_path)), lambda: load_encoder(model_path))
+
+
+def model_files_signature(model_path):
+    """Relative names, sizes and mtimes of every file in a model directory"""
+    signature = []
+    for directory, _, names in os.walk(model_path):
+        for name in names:
+            path = os.path.join(directory, name)
+            stat = os.stat(path)
+            signature.append((os.path.relpath(path, model_path), stat.st_size, stat.st_mtime_ns))
+    return repr(sorted(signature))
+
+
+def split_sections(text, max_chars=MAX_SECTION_CHARS):
+    """Split a document into paragraph-based sections of at most `max_chars` characters"""
+    sections = []
+    current = ''
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = ' '.join(paragraph.split())
+        while len(paragraph) > max_chars:
+            if current:
+                sections.append(current)
+                current = ''
+            sections.append(paragraph[:max_chars])
+            paragraph = paragraph[max_chars:]
+        if not paragraph:
+            continue
+        if current and len(current) + len(paragraph) + 1 > max_chars:
+            sections.append(current)
+            current = paragraph
+        else:
+            current = f"{current} {paragraph}" if current else paragraph
+    if current:
+        sections.append(current)
+    return sections
+
+
+class EmbeddingCache(FeatureCache):
+    """FeatureCache holding float32 vectors, keyed by text hash and model"""
+
+    def __init__(self, path=DEFAULT_EMBEDDING_CACHE_PATH, **kwargs):
+        super().__init__(path, **kwargs)
+
+    @staticmethod
+    def encode(vector):
+        return np.asarray(vector, dtype=np.float32).tobytes()
+
+    @staticmethod
+    def decode(payload):
+        return np.frombuffer(payload, dtype=np.float32)
+
+
+class SemanticEncoder:
+    """Turns documents into unit-length embeddings.
+
+    Documents are split into sections, and the sections of a whole batch
+    of documents are encoded together in large batches. A document vector
+    is the normalised mean of its section vectors. Section embeddings are
+    cached by content hash, so unchanged text is never encoded twice.
+    """
+
+    def __init__(self, model_path=DEFAULT_MODEL_PATH, cache=None, batch_size=DEFAULT_ENCODE_BATCH_SIZE):
+        self.model_path = model_path
+        self.cache = cache
+        self.batch_size = batch_size
+        # Replaced weights (same path, same config) must not hit old embeddings
+        config = os.path.join(model_path, "config.json")
+        self.model_id = code_fingerprint(os.path.abspath(model_path), config, model_files_signature(model_path))
+
+    @property
+    def model(self):
+        return get_encoder(self.model_path)
+
+    def encode_texts(self, texts):
+        """Embed each text as is; returns a (len(texts), dim) float32 array"""
+        vectors = [None] * len(texts)
+        digests = [content_hash(text.encode('utf-8')) for text in texts]
+        if self.cache is not None:
+            for i, digest in enumerate(digests):
+                vectors[i] = self.cache.get(digest, self.model_id)
+
+        pending = [i for i, vector in enumerate(vectors) if vector is None]
+        if pending:
+            encoded = self.model.encode([texts[i] for i in pending], batch_size=self.batch_size,
+                                        convert_to_numpy=True, normalize_embeddings=True,
+                                        show_progress_bar=False)
+            for i, vector in zip(pending, encoded):
+                vectors[i] = vector.astype(np.float32)
+                if self.cache is not None:
+                    self.cache.put(digests[i], self.model_id, vectors[i])
+
+        if not vectors:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.vstack(vectors)
+
+    def embed_documents(self, texts):
+        """One unit vector per document, encoding all sections in one pass"""
+        sections = [split_sections(text) or [''] for text in texts]
+        flat = [section for document in sections for section in document]
+        section_vectors = self.encode_texts(flat)
+        if not len(section_vectors):
+            return section_vectors
+
+        # Mean of each document's section vectors
+        owners = np.repeat(np.arange(len(texts)), [len(document) for document in sections])
+        sums = np.zeros((len(texts), section_vectors.shape[1]), dtype=np.float32)
+        np.add.at(sums, owners, section_vectors)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        return sums / np.where(norms > 0, norms, 1)
+
+
+class SemanticScorer:
+    """Cosine similarity of every resume × JD pair, blended into the base score.
+
+    Resume and JD vectors are multiplied once up front; lookups are by
+    resume file and JD name.
+    """
+
+    def __init__(self, resume_keys, resume_vectors, jd_keys, jd_vectors, weight=DEFAULT_SEMANTIC_WEIGHT):
+        if not 0 <= weight <= 1:
+            raise ValueError("Semantic weight must be between 0 and 1")
+        self.weight = weight
+        self._row = {key: i for i, key in enumerate(resume_keys)}
+        self._column = {key: j for j, key in enumerate(jd_keys)}
+        if len(resume_keys) and len(jd_keys):
+            self.similarity = np.clip(resume_vectors @ jd_vectors.T, 0, 1)
+        else:
+            self.similarity = np.zeros((len(resume_keys), len(jd_keys)), dtype=np.float32)
+
+    score_column = 'semantic_score'
+
+    def component_score(self, resume_key, jd_key):
+        return round(float(self.similarity[self._row[resume_key], self._column[jd_key]]) * 100, 2)
+
+    def rescore(self, score, resume_key, jd_key):
+        """Unrounded blend of an existing score with the pair's similarity"""
+        semantic = float(self.similarity[self._row[resume_key], self._column[jd_key]]) * 100
+        return (1 - self.weight) * score + self.weight * semantic
+
+    def reason(self, resume_key, jd_key):
+        return f"Semantic similarity: {self.component_score(resume_key, jd_key)}%"
+
+
+def embed_records(records, encoder):
+    """Store a resume embedding on each ingest record, encoding all resumes in one batch"""
+    vectors = encoder.embed_documents([record['text'] for record in records])
+    for record, vector in zip(records, vectors):
+        record['embedding'] = vector
+    return records
+
+
+def semantic_scorer(records, jd_texts, profiles, encoder, weight=DEFAULT_SEMANTIC_WEIGHT):
+    """SemanticScorer for embedded ingest records against JD texts"""
+    jd_vectors = encoder.embed_documents(jd_texts)
+    resume_vectors = np.vstack([record['embedding'] for record in records]) if records else None
+    return SemanticScorer([record['resume_file'] for record in records], resume_vectors,
+                          [profile.name for profile in profiles], jd_vectors, weight)
+
+
+if __name__ == "__main__":
+    from matcher import JobProfile, match_resume_to_profile, rescore_match_result
+
+    resume = "Backend engineer. Built REST services in Python and Django, deployed with Docker on AWS."
+    jd = "We need a Python web developer comfortable with cloud deployment and containers."
+
+    encoder = SemanticEncoder()
+    profile = JobProfile.from_text(jd, name='jd')
+    scorer = SemanticScorer(['resume'], encoder.embed_documents([resume]), ['jd'], encoder.embed_documents([jd]))
+    result = rescore_match_result(match_resume_to_profile(resume, profile), [scorer], 'resume', 'jd')
+
+    print(f"Keyword score: {result['keyword_score']}%")
+    print(f"Semantic score: {result['semantic_score']}%")
+    print(f"Blended score: {result['match_score']}%")
@@ -1,67 +1,154 @@
-import re
+import io
+from contextlib import contextmanager
 import PyPDF2
 import docx
-import pandas as pd
 import os
+import metrics
+from contact_extractor import extract_contacts
+from text_decoding import decode_bytes, read_text
 
+# Extraction budgets for untrusted uploads (the Streamlit apps). The batch
+# CLIs are unbounded unless --max-pdf-pages / --max-chars are given.
+UPLOAD_MAX_PDF_PAGES = 50
+UPLOAD_MAX_CHARS = 200_000
+
+# Documents can be given as a path, raw bytes (e.g. an upload's getvalue())
+# or a binary file-like object such as io.BytesIO or a Streamlit upload
+_IN_MEMORY = (bytes, bytearray, memoryview)
+
+def _is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+def _describe(source):
+    """Name of a document source for error messages"""
+    if _is_path(source):
+        return os.fspath(source)
+    return getattr(source, 'name', '<in-memory document>')
+
+@contextmanager
+def open_binary(source):
+    """Yield a readable binary file for a path, bytes or file-like source.
+
+    Bytes are wrapped in a BytesIO without copying; file-like objects are
+    rewound and used as is, and left open for the caller.
+    """
+    if _is_path(source):
+        with open(source, 'rb') as file:
+            yield file
+    elif isinstance(source, _IN_MEMORY):
+        yield io.BytesIO(source)
+    else:
+        source.seek(0)
+        yield source
+
+def read_bytes(source):
+    """Whole content of a path, bytes or file-like source"""
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, _IN_MEMORY):
+        return bytes(source)
+    if hasattr(source, 'getvalue'):
+        return source.getvalue()
+    with open_binary(source) as file:
+        return file.read()
+
+@metrics.timed('txt_read')
 def safe_text_read(file_path):
-    """Safely read text files with multiple encoding fallbacks"""
-    encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1', 'windows-1252']
-    
-    for encoding in encodings:
-        try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                return f.read()
-        except UnicodeDecodeError:
-            continue
-    
-    # If all encodings fail, use replace strategy
+    """Read a text document, detecting its encoding.
+
+    Accepts a path, bytes or a binary file-like object. The content is read
+    once and decoded by text_decoding (BOM, then UTF-8, then cp1252 or a
+    detected encoding); large files are decoded from a memory map.
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-            return f.read()
+        if _is_path(file_path):
+            return read_text(file_path)
+        return decode_bytes(read_bytes(file_path))
     except Exception as e:
-        print(f"All encoding attempts failed for {file_path}: {e}")
+        print(f"Error reading text file {_describe(file_path)}: {e}")
         return ""
 
-def extract_text_from_pdf(pdf_path):
-    """Basic PDF text extraction"""
+def iter_pdf_pages(pdf_path, max_pages=None, max_chars=None):
+    """Lazily yield the text of each non-empty PDF page.
+
+    Pages are parsed one at a time, so callers that stop iterating early
+    never pay for the rest of the document. `max_pages` caps the number of
+    pages read and `max_chars` caps the total characters yielded (the last
+    page is cut to fit). `pdf_path` may also be bytes or a file-like
+    object. Errors are raised to the caller.
+    """
+    with open_binary(pdf_path) as file:
+        reader = PyPDF2.PdfReader(file)
+        remaining = max_chars
+        for page_number, page in enumerate(reader.pages):
+            if max_pages is not None and page_number >= max_pages:
+                return
+            if remaining is not None and remaining <= 0:
+                return
+            
+            page_text = page.extract_text()
+            metrics.count('pdf_pages_total')
+            if not page_text:
+                continue
+            if remaining is not None:
+                page_text = page_text[:remaining]
+                remaining -= len(page_text)
+            yield page_text
+
+@metrics.timed('pdf_extract')
+def extract_text_from_pdf(pdf_path, max_pages=None, max_chars=None):
+    """Basic PDF text extraction from a path, bytes or file-like object"""
     try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            return text
+        # One join instead of repeated string concatenation across pages
+        return "".join(page_text + "\n" for page_text in iter_pdf_pages(pdf_path, max_pages, max_chars))
     except Exception as e:
-        print(f"Error reading PDF {pdf_path}: {e}")
+        print(f"Error reading PDF {_describe(pdf_path)}: {e}")
         return ""
 
+@metrics.timed('docx_extract')
 def extract_text_from_docx(docx_path):
-    """Basic DOCX text extraction"""
+    """Basic DOCX text extraction from a path, bytes or file-like object"""
     try:
-        doc = docx.Document(docx_path)
+        with open_binary(docx_path) as file:
+            doc = docx.Document(file)
         full_text = []
         for paragraph in doc.paragraphs:
             if paragraph.text.strip():
                 full_text.append(paragraph.text)
         return "\n".join(full_text)
     except Exception as e:
-        print(f"Error reading DOCX {docx_path}: {e}")
+        print(f"Error reading DOCX {_describe(docx_path)}: {e}")
         return ""
 
+def extract_document_text(source, file_name=None, max_pages=None, max_chars=None):
+    """Extract a resume's text, dispatching on the extension of `file_name`.
+
+    `file_name` defaults to the path or the file object's name; unnamed
+    bytes are read as text. `max_pages` caps the PDF pages parsed and
+    `max_chars` the characters returned for any format, so an oversized
+    upload cannot stall ingest.
+    """
+    file_name = file_name or _describe(source)
+    if file_name.endswith('.pdf'):
+        return extract_text_from_pdf(source, max_pages, max_chars)
+    if file_name.endswith('.docx'):
+        text = extract_text_from_docx(source)
+    else:  # txt file
+        text = safe_text_read(source)
+    return text[:max_chars] if max_chars is not None else text
+
+@metrics.timed('basic_fields')
 def extract_basic_fields(text):
-    """Extract email and phone using simple regex"""
+    """Extract email, phone and URLs with one bounded regex pass"""
     if not text:
-        return {'email': '', 'phone': '', 'text': ''}
+        return {'email': '', 'phone': '', 'urls': [], 'text': ''}
     
-    email = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-    phone = re.findall(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]', text)
+    contacts = extract_contacts(text)
     
     return {
-        'email': email[0] if email else '',
-        'phone': phone[0] if phone else '',
+        'email': contacts.email,
+        'phone': contacts.phone,
+        'urls': contacts.urls,
         'text': text
     }
 
@@ -0,0 +1,240 @@
+import os
+import sys
+
+import numpy as np
+
+from taxonomy import get_taxonomy
+
+INDEX_FORMAT_VERSION = 1
+
+
+class SkillIndex:
+    """Inverted index from skill ID to the resumes that mention it.
+
+    Resumes are identified by a string key (e.g. the file name) and stored
+    internally as dense document numbers. Postings for each skill live in
+    a sorted NumPy array plus a small list of recent additions; removed
+    resumes are tombstoned until compact() rewrites the postings.
+
+    Queries only touch the postings of the JD's skills, so their cost grows
+    with the number of matching resumes rather than the corpus size.
+
+    Skill IDs are taxonomy positions, so the index records the fingerprint
+    of the taxonomy it was built with (None for a synthetic index given
+    only `n_skills`).
+    """
+
+    def __init__(self, n_skills=None, taxonomy_fingerprint=None):
+        if n_skills is None:
+            taxonomy = get_taxonomy()
+            n_skills = len(taxonomy)
+            taxonomy_fingerprint = taxonomy.fingerprint
+        self.n_skills = n_skills
+        self.taxonomy_fingerprint = taxonomy_fingerprint
+        self._keys = []
+        self._doc_of = {}
+        self._alive = bytearray()
+        self._dead = 0
+        self._base = [np.empty(0, dtype=np.int32) for _ in range(n_skills)]
+        self._delta = [[] for _ in range(n_skills)]
+
+    def __len__(self):
+        return len(self._doc_of)
+
+    def __contains__(self, key):
+        return key in self._doc_of
+
+    def keys(self):
+        return self._doc_of.keys()
+
+    def matches_taxonomy(self, taxonomy=None):
+        """Whether the stored skill IDs mean the same skills in `taxonomy` (default: the current one)"""
+        taxonomy = taxonomy or get_taxonomy()
+        return self.taxonomy_fingerprint == taxonomy.fingerprint and self.n_skills == len(taxonomy)
+
+    def add(self, key, skill_ids):
+        """Index a resume, replacing any previous entry with the same key"""
+        self.remove(key)
+
+        doc = len(self._keys)
+        self._keys.append(key)
+        self._doc_of[key] = doc
+        self._alive.append(1)
+        for skill_id in skill_ids:
+            if skill_id >= self.n_skills:
+                raise ValueError(f"Skill ID {skill_id} is outside the index ({self.n_skills} skills)")
+            self._delta[skill_id].append(doc)
+
+    def add_many(self, keys, skill_id_sets):
+        """Index many resumes at once"""
+        for key, skill_ids in zip(keys, skill_id_sets):
+            self.add(key, skill_ids)
+
+    def remove(self, key):
+        """Withdraw a resume; returns False if it was not indexed"""
+        doc = self._doc_of.pop(key, None)
+        if doc is None:
+            return False
+        self._alive[doc] = 0
+        self._keys[doc] = None
+        self._dead += 1
+        return True
+
+    def _postings(self, skill_id):
+        base = self._base[skill_id]
+        delta = self._delta[skill_id]
+        if not delta:
+            return base
+        return np.concatenate([base, np.asarray(delta, dtype=np.int32)])
+
+    def overlap_counts(self, skill_ids, min_overlap=1):
+        """Return (doc numbers, overlap counts) of live resumes sharing at least `min_overlap` skills"""
+        parts = [self._postings(s) for s in set(skill_ids) if s < self.n_skills]
+        parts = [p for p in parts if len(p)]
+        if not parts or min_overlap > len(parts):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        docs = np.concatenate(parts) if len(parts) > 1 else parts[0]
+        if len(docs) * 8 < len(self._keys):
+            # Selective query: cost depends only on the postings touched
+            hits, counts = np.unique(docs, return_counts=True)
+        else:
+            counts = np.bincount(docs, minlength=len(self._keys))
+            hits = np.arange(len(counts))
+
+        if self._dead:
+            alive = np.frombuffer(bytes(self._alive), dtype=np.uint8).astype(bool)
+            keep = alive[hits] & (counts >= min_overlap)
+        else:
+            keep = counts >= min_overlap
+        return hits[keep], counts[keep]
+
+    def candidates(self, skill_ids, min_overlap=1):
+        """Return {resume key: overlap count} for resumes sharing at least `min_overlap` skills.
+
+        min_overlap=1 is the union of the posting lists; min_overlap equal
+        to the number of skills is their intersection.
+        """
+        hits, counts = self.overlap_counts(skill_ids, min_overlap)
+        keys = self._keys
+        return {keys[doc]: int(count) for doc, count in zip(hits.tolist(), counts.tolist())}
+
+    def query(self, profile, min_overlap=1):
+        """Candidate resumes for a JobProfile as (key, matched count, score), best first.
+
+        Scores use the calculate_match_score formula; resumes outside the
+        candidate set would all score 0.
+        """
+        total = len(profile.skill_ids)
+        results = [
+            (key, matched, round((matched / total) * 100, 2))
+            for key, matched in self.candidates(profile.skill_ids, min_overlap).items()
+        ]
+        results.sort(key=lambda item: (-item[1], item[0]))
+        return results
+
+    def compact(self):
+        """Merge recent additions into the base arrays and drop removed resumes"""
+        alive = np.frombuffer(bytes(self._alive), dtype=np.uint8).astype(bool)
+        new_number = np.cumsum(alive, dtype=np.int64) - 1
+
+        for skill_id in range(self.n_skills):
+            postings = self._postings(skill_id)
+            if self._dead:
+                postings = new_number[postings[alive[postings]]]
+            self._base[skill_id] = postings.astype(np.int32)
+            self._delta[skill_id] = []
+
+        if self._dead:
+            self._keys = [key for key in self._keys if key is not None]
+            self._doc_of = {key: doc for doc, key in enumerate(self._keys)}
+            self._alive = bytearray(b'\x01' * len(self._keys))
+            self._dead = 0
+
+    def save(self, path):
+        """Compact and write the index to a single .npz file"""
+        self.compact()
+        lengths = [len(p) for p in self._base]
+        skill_indptr = np.zeros(self.n_skills + 1, dtype=np.int64)
+        skill_indptr[1:] = np.cumsum(lengths)
+        postings = np.concatenate(self._base) if self._base else np.empty(0, dtype=np.int32)
+
+        encoded = [key.encode('utf-8') for key in self._keys]
+        key_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        key_offsets[1:] = np.cumsum([len(k) for k in encoded])
+        key_bytes = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, format_version=INDEX_FORMAT_VERSION, n_skills=self.n_skills,
+                     taxonomy_fingerprint=self.taxonomy_fingerprint or '',
+                     skill_indptr=skill_indptr, postings=postings,
+                     key_offsets=key_offsets, key_bytes=key_bytes)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            if int(data['format_version']) != INDEX_FORMAT_VERSION:
+                raise ValueError(f"Unsupported skill index format in {path}")
+            # Indexes saved before fingerprints were stored match no taxonomy
+            fingerprint = str(data['taxonomy_fingerprint']) if 'taxonomy_fingerprint' in data.files else ''
+            index = cls(int(data['n_skills']), fingerprint or None)
+            skill_indptr = data['skill_indptr']
+            postings = data['postings']
+            key_offsets = data['key_offsets']
+            key_bytes = data['key_bytes'].tobytes()
+
+        index._base = [postings[skill_indptr[i]:skill_indptr[i + 1]] for i in range(index.n_skills)]
+        index._keys = [key_bytes[key_offsets[i]:key_offsets[i + 1]].decode('utf-8')
+                       for i in range(len(key_offsets) - 1)]
+        index._doc_of = {key: doc for doc, key in enumerate(index._keys)}
+        index._alive = bytearray(b'\x01' * len(index._keys))
+        return index
+
+    @classmethod
+    def open(cls, path):
+        """Load the index at `path` for the current taxonomy.
+
+        Starts an empty index when there is no file, or when the file was
+        built with a different taxonomy (its postings would point at the
+        wrong skills); the caller then rebuilds it from its records.
+        """
+        if os.path.exists(path):
+            index = cls.load(path)
+            if index.matches_taxonomy():
+                return index
+            print(f"Skill index {path} was built with a different skill taxonomy; rebuilding it")
+        return cls()
+
+
+def sync_skill_index(index, records):
+    """Make `index` hold exactly these ingest records: add or update them and drop the rest"""
+    current = {record['resume_file'] for record in records}
+    for key in [key for key in index.keys() if key not in current]:
+        index.remove(key)
+    for record in records:
+        index.add(record['resume_file'], record['skill_ids'])
+
+
+if __name__ == "__main__":
+    # Query an index built by main.py --index
+    if len(sys.argv) != 3:
+        print("Usage: python skill_index.py <index.npz> <jd.txt>")
+        sys.exit(1)
+
+    from matcher import JobProfile
+
+    from text_decoding import read_text
+
+    index = SkillIndex.load(sys.argv[1])
+    if not index.matches_taxonomy():
+        print(f"{sys.argv[1]} was built with a different skill taxonomy; rebuild it with main.py --index")
+        sys.exit(1)
+    profile = JobProfile.from_text(read_text(sys.argv[2]), name=os.path.basename(sys.argv[2]))
+
+    print(f"{len(index)} indexed resumes, JD skills: {', '.join(profile.skills)}")
+    for key, matched, score in index.query(profile)[:20]:
+        print(f"{score:6.2f}%  {matched:3d}  {key}")
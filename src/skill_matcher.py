@@ -0,0 +1,124 @@
+import re
+
+
+# Text required before and after a term for each boundary mode
+_BOUNDARY_PATTERNS = {
+    'word': (r'\b', r'\b'),
+    'token': (r'(?<!\w)', r'(?!\w)'),
+    None: ('', ''),
+}
+
+
+def _is_word_char(ch):
+    """Mirror re's \\w for str patterns: alphanumerics plus underscore"""
+    return ch == '_' or ch.isalnum()
+
+
+def _build_trie(terms):
+    """Build a character trie; the '' key marks the end of a term"""
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = True
+    return trie
+
+
+def _trie_to_regex(node):
+    """Turn a trie into a regex that prefers the longest term at a position"""
+    branches = []
+    for ch in sorted(k for k in node if k):
+        branches.append(re.escape(ch) + _trie_to_regex(node[ch]))
+
+    if not branches:
+        return ''
+
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # Greedy optional: try the longer continuation first, then stop here
+        if len(branches) == 1 and len(branches[0]) == 1:
+            return body + '?'
+        return '(?:' + body + ')?'
+    return body
+
+
+class SkillMatcher:
+    """Find every vocabulary term in a text with one compiled regex pass.
+
+    The vocabulary is compiled once into a trie-shaped regex wrapped in a
+    lookahead, so each start position is tried exactly once and the longest
+    term there is captured. Shorter terms that are prefixes of that match
+    (e.g. "machine" inside "machine learning") are resolved from a table
+    built at compile time, which keeps results identical to searching for
+    each term separately.
+
+    boundary='word' reproduces re.search(r'\\b' + re.escape(term) + r'\\b')
+    per term; boundary='token' only requires that the term is not glued to
+    a word character on either side, so terms such as "c++" or "c#" match
+    as written; boundary=None reproduces a plain `term in text` check.
+    """
+
+    def __init__(self, terms, boundary='word'):
+        if boundary not in _BOUNDARY_PATTERNS:
+            raise ValueError(f"Unknown boundary mode: {boundary!r}")
+        self.terms = tuple(terms)
+        self.boundary = boundary
+
+        # A term may appear more than once; keep every index so the output
+        # matches a loop over the original list
+        self._indices = {}
+        for i, term in enumerate(self.terms):
+            self._indices.setdefault(term, []).append(i)
+
+        unique_terms = [t for t in self._indices if t]
+        trie = _build_trie(unique_terms)
+        self._implied = {t: self._prefix_terms(t, trie) for t in unique_terms}
+
+        if unique_terms:
+            before, after = _BOUNDARY_PATTERNS[boundary]
+            body = before + '(' + _trie_to_regex(trie) + ')' + after
+            self._pattern = re.compile('(?=' + body + ')')
+        else:
+            self._pattern = None
+
+    def _prefix_terms(self, term, trie):
+        """Shorter terms that also match wherever `term` matches"""
+        found = []
+        node = trie
+        for pos, ch in enumerate(term[:-1], start=1):
+            node = node[ch]
+            if '' not in node:
+                continue
+            # Both characters around the prefix end lie inside `term`, so
+            # the boundary test can be decided here instead of per match
+            if self.boundary == 'word' and \
+                    _is_word_char(term[pos - 1]) == _is_word_char(term[pos]):
+                continue
+            if self.boundary == 'token' and _is_word_char(term[pos]):
+                continue
+            found.append(term[:pos])
+        return tuple(found)
+
+    def find_indices(self, text):
+        """Return the set of vocabulary indices present in an already-lowercased text"""
+        found = set()
+        if self._pattern is None or not text:
+            return found
+
+        seen = set()
+        for m in self._pattern.finditer(text):
+            term = m.group(1)
+            if term in seen:
+                continue
+            seen.add(term)
+            found.update(self._indices[term])
+            for prefix in self._implied[term]:
+                if prefix not in seen:
+                    seen.add(prefix)
+                    found.update(self._indices[prefix])
+        return found
+
+    def find(self, text):
+        """Return matched terms from an already-lowercased text, in vocabulary order"""
+        return [self.terms[i] for i in sorted(self.find_indices(text))]
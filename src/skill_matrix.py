@@ -0,0 +1,95 @@
+import numpy as np
+from scipy import sparse
+
+from taxonomy import get_taxonomy
+
+
+def build_skill_matrix(skill_id_sets, n_skills):
+    """Encode skill-ID sets as a binary CSR matrix with one row per set"""
+    indptr = [0]
+    indices = []
+    for skill_ids in skill_id_sets:
+        indices.extend(sorted(skill_ids))
+        indptr.append(len(indices))
+
+    data = np.ones(len(indices), dtype=np.int32)
+    return sparse.csr_matrix(
+        (data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, n_skills)
+    )
+
+
+class PairScores:
+    """Match counts and scores for every resume × JD pair.
+
+    `matched[r, j]` is the number of JD j's skills found in resume r.
+    `scores` uses the same arithmetic as calculate_match_score, so
+    round(scores[r, j], 2) equals match_resume_to_jd(...)['match_score'].
+    """
+
+    __slots__ = ('matched', 'resume_totals', 'jd_totals')
+
+    def __init__(self, matched, resume_totals, jd_totals):
+        self.matched = matched
+        self.resume_totals = resume_totals
+        self.jd_totals = jd_totals
+
+    @property
+    def shape(self):
+        return self.matched.shape
+
+    @property
+    def missing(self):
+        return self.jd_totals[np.newaxis, :] - self.matched
+
+    @property
+    def scores(self):
+        # (len(matched) / len(jd_skills)) * 100, and 0 for JDs without skills
+        totals = self.jd_totals[np.newaxis, :]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = (self.matched / totals) * 100
+        return np.where(totals > 0, scores, 0.0)
+
+    def score(self, resume_index, jd_index):
+        """Rounded score for one pair, identical to the per-pair matcher"""
+        return round(float(self.scores_for_jd(jd_index)[resume_index]), 2)
+
+    def scores_for_jd(self, jd_index):
+        total = self.jd_totals[jd_index]
+        if not total:
+            return np.zeros(self.matched.shape[0])
+        return (self.matched[:, jd_index] / total) * 100
+
+
+def score_skill_matrices(resume_matrix, jd_matrix):
+    """Score every resume row against every JD row with one sparse product"""
+    matched = (resume_matrix @ jd_matrix.T).toarray()
+    resume_totals = np.asarray(resume_matrix.sum(axis=1)).ravel()
+    jd_totals = np.asarray(jd_matrix.sum(axis=1)).ravel()
+    return PairScores(matched, resume_totals, jd_totals)
+
+
+def score_all_pairs(resume_skill_sets, profiles, n_skills=None):
+    """Score skill-ID sets against JobProfiles in bulk"""
+    if n_skills is None:
+        n_skills = len(get_taxonomy())
+    resume_matrix = build_skill_matrix(resume_skill_sets, n_skills)
+    jd_matrix = build_skill_matrix([profile.skill_ids for profile in profiles], n_skills)
+    return score_skill_matrices(resume_matrix, jd_matrix)
+
+
+def jd_columns(resume_skill_sets, profiles, n_skills=None):
+    """Yield each profile's column of matched counts against every resume, one JD at a time.
+
+    The resume matrix is built once, column-major, and a JD's column sums
+    the columns of its skills, so only one length-R column is held at a
+    time rather than the whole R x J product.
+    """
+    if n_skills is None:
+        n_skills = len(get_taxonomy())
+    resume_matrix = build_skill_matrix(resume_skill_sets, n_skills).tocsc()
+    for profile in profiles:
+        if profile.skill_ids:
+            yield np.asarray(resume_matrix[:, sorted(profile.skill_ids)].sum(axis=1)).ravel()
+        else:
+            yield np.zeros(resume_matrix.shape[0], dtype=np.int64)
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+
+from skill_matcher import SkillMatcher
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skills_taxonomy.json')
+
+
+class SkillTaxonomy:
+    """Immutable skill vocabulary with aliases resolved to integer IDs.
+
+    Skill IDs are positions in `names`, so a set of IDs can be turned back
+    into canonical names in taxonomy order. Every surface form (canonical
+    name or alias) is compiled into one SkillMatcher at construction time.
+    `fingerprint` identifies the name and alias to ID mapping, so data
+    stored by skill ID can tell when the taxonomy was edited or reordered.
+    """
+
+    __slots__ = ('version', 'names', 'ids', 'fingerprint', '_surface_ids', '_matcher')
+
+    def __init__(self, skills, version=None):
+        names = []
+        ids = {}
+        surface_forms = []
+        surface_ids = []
+
+        for entry in skills:
+            name = sys.intern(entry['name'].strip().lower())
+            if name in ids:
+                raise ValueError(f"Duplicate skill in taxonomy: {name!r}")
+            skill_id = len(names)
+            names.append(name)
+
+            for form in [name] + list(entry.get('aliases', [])):
+                form = sys.intern(form.strip().lower())
+                if ids.get(form, skill_id) != skill_id:
+                    raise ValueError(f"Alias {form!r} maps to both {names[ids[form]]!r} and {name!r}")
+                if form in ids:
+                    continue
+                ids[form] = skill_id
+                surface_forms.append(form)
+                surface_ids.append(skill_id)
+
+        self.version = version
+        self.names = tuple(names)
+        self.ids = MappingProxyType(ids)
+        self.fingerprint = hashlib.sha256(json.dumps([names, sorted(ids.items())]).encode('utf-8')).hexdigest()[:16]
+        self._surface_ids = tuple(surface_ids)
+        # Aliases are matched as whole tokens so "c++" and "c#" are found as written
+        self._matcher = SkillMatcher(surface_forms, boundary='token')
+
+    def __len__(self):
+        return len(self.names)
+
+    def find_ids(self, text):
+        """Return the frozenset of skill IDs mentioned in `text`"""
+        surface_ids = self._surface_ids
+        return frozenset(surface_ids[i] for i in self._matcher.find_indices(text.lower()))
+
+    def to_names(self, skill_ids):
+        """Return canonical names for `skill_ids` in taxonomy order"""
+        names = self.names
+        return [names[i] for i in sorted(skill_ids)]
+
+    def find(self, text):
+        """Return canonical names of the skills mentioned in `text`"""
+        return self.to_names(self.find_ids(text))
+
+
+@lru_cache(maxsize=None)
+def load_taxonomy(path=DEFAULT_TAXONOMY_PATH):
+    """Load and compile a taxonomy file; each path is loaded once per process"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return SkillTaxonomy(data['skills'], version=data.get('version'))
+
+
+def get_taxonomy():
+    """Return the process-wide default taxonomy"""
+    return load_taxonomy(DEFAULT_TAXONOMY_PATH)
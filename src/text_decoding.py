@@ -0,0 +1,171 @@
+import codecs
+import mmap
+import os
+
+# Files at least this large are decoded straight from a memory map
+MMAP_THRESHOLD = 1024 * 1024
+
+# Longest first: the UTF-32 LE BOM starts with the UTF-16 LE one
+BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# Bytes sampled by the statistical checks
+SAMPLE_SIZE = 64 * 1024
+
+# Above this share of non-ASCII bytes a failed UTF-8 file is probably not
+# Western European, so the optional detector is asked for its guess
+NON_ASCII_RATIO = 0.3
+# Shorter samples give the detector too little to go on
+MIN_DETECT_BYTES = 64
+
+# Signs of UTF-8 that was decoded as cp1252 and encoded again ("Ã©" for "é",
+# "â€™" for "’"). Single characters, since str searches for those are fastest
+MOJIBAKE_MARKERS = ('Ã', 'Â', 'â')
+
+_ASCII = bytes(range(128))
+# cp1252 and latin-1 only differ on 0x80-0x9F (C1 controls in latin-1)
+_NOT_C1 = bytes(range(0x80)) + bytes(range(0xA0, 0x100))
+
+
+def _cp1252_c1():
+    table = {}
+    for byte in range(0x80, 0xA0):
+        try:
+            table[chr(byte)] = bytes([byte]).decode('cp1252')
+        except UnicodeDecodeError:
+            pass  # one of the five bytes cp1252 leaves undefined
+    return table
+
+
+CP1252_C1 = _cp1252_c1()
+
+
+def bom_encoding(data):
+    """Codec named by a byte order mark at the start of `data`, or None"""
+    head = bytes(data[:4])
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    return None
+
+
+def utf16_encoding(sample):
+    """'utf-16-le' / 'utf-16-be' for BOM-less UTF-16 of mostly ASCII text, else None"""
+    if len(sample) < 4 or len(sample) % 2:
+        return None
+    even_zeros = sample[0::2].count(0)
+    odd_zeros = sample[1::2].count(0)
+    half = len(sample) // 2
+    if odd_zeros > half * 0.4 and even_zeros < half * 0.05:
+        return 'utf-16-le'
+    if even_zeros > half * 0.4 and odd_zeros < half * 0.05:
+        return 'utf-16-be'
+    return None
+
+
+def detected_encoding(sample):
+    """Encoding guessed by charset_normalizer, or None when it is not installed or unsure"""
+    try:
+        from charset_normalizer import from_bytes
+    except ImportError:
+        return None
+    best = from_bytes(sample).best()
+    if best is None or best.encoding.startswith(('utf_16', 'utf_32')):
+        # Multi-byte Unicode without a BOM is only trusted from utf16_encoding
+        return None
+    return best.encoding
+
+
+def undo_double_encoding(text):
+    """Repair UTF-8 text that was once decoded as cp1252 and re-encoded ("rÃ©sumÃ©")"""
+    if not any(marker in text for marker in MOJIBAKE_MARKERS):
+        return text
+    try:
+        return text.encode('cp1252').decode('utf-8')
+    except UnicodeError:
+        # Not consistently double-encoded; leave it alone
+        return text
+
+
+def normalize_newlines(text):
+    """Turn Windows (\\r\\n) and old Mac (\\r) line endings into \\n, as text-mode open() does"""
+    if '\r' not in text:
+        return text
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def decode_bytes(data, detect=True):
+    """Decode a text document's bytes, with line endings normalised to \\n.
+
+    A BOM wins; then strict UTF-8, which is fast and almost never succeeds
+    on anything else. Failing that, cp1252, the usual encoding of Western
+    files that are not UTF-8 (it agrees with latin-1 except for the
+    0x80-0x9F range, where it has curly quotes and dashes instead of
+    control characters). With `detect`, BOM-less UTF-16 is recognised,
+    double-encoded UTF-8 is repaired, and charset_normalizer (if installed)
+    is consulted for files that look like a non-Western single-byte
+    encoding. `data` may be bytes or any buffer, such as an mmap.
+    """
+    return normalize_newlines(_decode(data, detect))
+
+
+def decode_cp1252(data):
+    """cp1252, or latin-1 when `data` holds a byte cp1252 leaves undefined.
+
+    Decodes as latin-1, which is a plain copy, and then replaces only the
+    0x80-0x9F characters actually present; the cp1252 charmap codec looks
+    up every byte and is several times slower.
+    """
+    raw = data if isinstance(data, bytes) else bytes(data)
+    text = str(raw, 'latin-1')
+    for char in set(raw.translate(None, _NOT_C1).decode('latin-1')):
+        if char not in CP1252_C1:
+            return str(raw, 'latin-1')
+        text = text.replace(char, CP1252_C1[char])
+    return text
+
+
+def _decode(data, detect):
+    encoding = bom_encoding(data)
+    if encoding is not None:
+        return str(data, encoding, errors='replace')
+
+    try:
+        text = str(data, 'utf-8')
+    except UnicodeDecodeError:
+        pass
+    else:
+        return undo_double_encoding(text) if detect else text
+
+    if detect:
+        # Only samples that could be UTF-16 (NUL bytes) or a non-Western
+        # encoding (mostly non-ASCII) pay for the checks
+        sample = bytes(data[:SAMPLE_SIZE])
+        encoding = utf16_encoding(sample) if 0 in sample else None
+        if encoding is None and len(sample) >= MIN_DETECT_BYTES:
+            non_ascii = len(sample.translate(None, _ASCII))
+            if non_ascii > len(sample) * NON_ASCII_RATIO:
+                encoding = detected_encoding(sample)
+        if encoding is not None:
+            return str(data, encoding, errors='replace')
+
+    return decode_cp1252(data)
+
+
+def read_text(path, detect=True, mmap_threshold=MMAP_THRESHOLD):
+    """Read a text file once and decode it with decode_bytes.
+
+    Files of `mmap_threshold` bytes or more are decoded from a read-only
+    memory map, so their bytes are never copied into a Python object.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < mmap_threshold or size == 0:
+            return decode_bytes(f.read(), detect)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return decode_bytes(mapped, detect)
@@ -0,0 +1,414 @@
+import json
+import os
+import sys
+
+import numpy as np
+
+INDEX_FORMAT_VERSION = 2
+PRECISIONS = ('int8', 'fp16')
+
+# Rows scored per block when assigning vectors to lists
+ASSIGN_BLOCK = 65536
+
+# Share of the trained rows that may be added or removed before update_vector_index retrains the lists
+RETRAIN_DRIFT = 0.3
+
+
+def default_n_lists(count):
+    """About √n inverted lists, which keeps training and probing cheap in NumPy"""
+    return max(1, min(count, int(np.sqrt(count))))
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+
+def train_centroids(vectors, n_lists, iterations=10, sample_per_list=64, seed=0):
+    """Spherical k-means on a sample of `vectors`; returns unit-length centroids"""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), n_lists * sample_per_list)
+    sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))], dtype=np.float32)
+    centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        counts = np.bincount(assignment, minlength=n_lists)
+        # Empty lists keep their old centroid
+        filled = counts > 0
+        centroids[filled] = sums[filled]
+        centroids = _normalize(centroids)
+    return centroids
+
+
+def assign_lists(vectors, centroids):
+    """Index of the closest centroid for every vector, computed in blocks"""
+    assignment = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), ASSIGN_BLOCK):
+        block = np.asarray(vectors[start:start + ASSIGN_BLOCK], dtype=np.float32)
+        assignment[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return assignment
+
+
+def quantize(vectors, precision):
+    """Return (codes, scales); int8 codes use one symmetric scale per vector"""
+    if precision == 'fp16':
+        return vectors.astype(np.float16), None
+    peaks = np.abs(vectors).max(axis=1)
+    scales = np.where(peaks > 0, peaks / 127, 1).astype(np.float32)
+    codes = np.rint(vectors / scales[:, np.newaxis]).astype(np.int8)
+    return codes, scales
+
+
+def _encode_keys(keys):
+    encoded = [key.encode('utf-8') for key in keys]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(k) for k in encoded])
+    return offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+
+def _decode_keys(offsets, data):
+    data = data.tobytes()
+    return [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+
+
+class VectorIndex:
+    """IVF (inverted file) index over unit-length embeddings for CPU top-K search.
+
+    Vectors are grouped into lists around k-means centroids and stored
+    quantized (int8 or fp16), sorted by list so each list is one contiguous
+    slice. A query scores the centroids, scans only the `n_probe` closest
+    lists on the quantized codes and re-ranks the shortlist with the exact
+    float32 vectors. On disk every array is a .npy file opened with
+    mmap_mode='r', so only the touched slices are paged in.
+
+    The lists are trained once. Vectors added later go to their closest
+    trained centroid in a second, list-sorted segment, and removed rows
+    are tombstoned, so saving an update rewrites only that segment.
+    `drift` measures how far the index has moved from the trained rows.
+    `model_id` identifies the embedding model the vectors came from.
+    """
+
+    def __init__(self, keys, centroids, list_offsets, codes, scales, exact, precision, model_id=None):
+        self.keys = keys
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.codes = codes
+        self.scales = scales
+        self.exact = exact
+        self.precision = precision
+        self.model_id = model_id
+        self.alive = np.ones(len(keys), dtype=bool)
+        self.n_removed = 0
+        self._row_of = None
+        self._saved_to = None
+        dim = centroids.shape[1]
+        self._set_added([], np.zeros(len(centroids) + 1, dtype=np.int64), np.empty((0, dim), dtype=codes.dtype),
+                        None if scales is None else np.empty(0, dtype=np.float32),
+                        None if exact is None else np.empty((0, dim), dtype=np.float32))
+
+    def __len__(self):
+        return len(self.keys) - self.n_removed + len(self.added_keys)
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    @property
+    def dim(self):
+        return self.centroids.shape[1]
+
+    @property
+    def drift(self):
+        """Rows added or removed since training, as a share of the trained rows"""
+        return (len(self.added_keys) + self.n_removed) / max(1, len(self.keys))
+
+    @classmethod
+    def build(cls, keys, vectors, n_lists=None, precision='int8', keep_exact=True, seed=0, model_id=None):
+        """Train the lists and quantize `vectors` (one row per key)"""
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision {precision!r}, expected one of {PRECISIONS}")
+        vectors = _normalize(vectors)
+        if len(keys) != len(vectors):
+            raise ValueError("Need exactly one vector per key")
+        if not len(keys):
+            raise ValueError("Cannot build a vector index without vectors")
+
+        n_lists = min(n_lists or default_n_lists(len(vectors)), len(vectors))
+        centroids = train_centroids(vectors, n_lists, seed=seed)
+        assignment = assign_lists(vectors, centroids)
+
+        order = np.argsort(assignment, kind='stable')
+        list_offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        list_offsets[1:] = np.cumsum(np.bincount(assignment, minlength=n_lists))
+
+        vectors = vectors[order]
+        codes, scales = quantize(vectors, precision)
+        return cls([keys[i] for i in order.tolist()], centroids, list_offsets, codes, scales,
+                   vectors if keep_exact else None, precision, model_id)
+
+    def _set_added(self, keys, offsets, codes, scales, exact):
+        """Replace the added segment (rows already sorted by list)"""
+        self.added_keys = keys
+        self.added_offsets = offsets
+        self.added_codes = codes
+        self.added_scales = scales
+        self.added_exact = exact
+        self._added_row_of = {key: row for row, key in enumerate(keys)}
+
+    def _regroup_added(self, keys, lists, codes, scales, exact):
+        order = np.argsort(lists, kind='stable')
+        offsets = np.zeros(self.n_lists + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(lists, minlength=self.n_lists))
+        self._set_added([keys[i] for i in order.tolist()], offsets, codes[order],
+                        None if scales is None else scales[order], None if exact is None else exact[order])
+
+    def _added_lists(self):
+        return np.repeat(np.arange(self.n_lists), np.diff(self.added_offsets))
+
+    def remove(self, keys):
+        """Drop rows by key; unknown keys are ignored"""
+        keys = set(keys)
+        if self._row_of is None:
+            # Tombstoned rows keep their key, so only live rows may be looked up
+            self._row_of = {key: row for row, key in enumerate(self.keys) if self.alive[row]}
+        for key in keys:
+            row = self._row_of.pop(key, None)
+            if row is not None:
+                self.alive[row] = False
+                self.n_removed += 1
+
+        if not keys.isdisjoint(self._added_row_of):
+            keep = np.array([row for row, key in enumerate(self.added_keys) if key not in keys], dtype=np.int64)
+            self._regroup_added([self.added_keys[row] for row in keep.tolist()], self._added_lists()[keep],
+                                self.added_codes[keep],
+                                None if self.added_scales is None else self.added_scales[keep],
+                                None if self.added_exact is None else self.added_exact[keep])
+
+    def add(self, keys, vectors):
+        """Put `vectors` in the lists of their closest trained centroids, replacing rows with the same keys"""
+        keys = list(keys)
+        if len(keys) != len(vectors):
+            raise ValueError("Need exactly one vector per key")
+        self.remove(keys)
+        if not keys:
+            return
+        vectors = _normalize(vectors)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+
+        codes, scales = quantize(vectors, self.precision)
+        self._regroup_added(self.added_keys + keys,
+                            np.concatenate([self._added_lists(), assign_lists(vectors, self.centroids)]),
+                            np.concatenate([self.added_codes, codes]),
+                            None if scales is None else np.concatenate([self.added_scales, scales]),
+                            None if self.added_exact is None else np.concatenate([self.added_exact, vectors]))
+
+    def key(self, row):
+        """Key of a stored row; added rows are numbered after the trained ones"""
+        n_trained = len(self.keys)
+        return self.keys[row] if row < n_trained else self.added_keys[row - n_trained]
+
+    def live_rows(self):
+        """Row numbers of every vector that has not been removed"""
+        n_trained = len(self.keys)
+        return np.concatenate([np.flatnonzero(self.alive),
+                               np.arange(n_trained, n_trained + len(self.added_keys))])
+
+    def _segments(self):
+        """(codes, scales, exact, list offsets, first row number) of the trained and the added rows"""
+        return [(self.codes, self.scales, self.exact, self.list_offsets, 0),
+                (self.added_codes, self.added_scales, self.added_exact, self.added_offsets, len(self.keys))]
+
+    def vectors(self, rows):
+        """Float32 vectors for stored rows: exact if kept, otherwise dequantized"""
+        rows = np.asarray(rows, dtype=np.int64)
+        added = rows >= len(self.keys)
+        result = np.empty((len(rows), self.dim), dtype=np.float32)
+        for (codes, scales, exact, _, first), mask in zip(self._segments(), (~added, added)):
+            part = rows[mask] - first
+            if exact is not None:
+                result[mask] = exact[part]
+                continue
+            block = np.asarray(codes[part], dtype=np.float32)
+            if scales is not None:
+                block *= scales[part][:, np.newaxis]
+            result[mask] = block
+        return result
+
+    def search(self, query, k=10, n_probe=8, rerank=None):
+        """Approximate top-k as [(key, cosine similarity)], best first.
+
+        `rerank` (default 4·k) candidates from the quantized scan are
+        re-scored exactly; n_probe=n_lists makes the scan exhaustive.
+        """
+        query = _normalize(query)
+        rerank = max(k, rerank if rerank is not None else 4 * k)
+        n_probe = min(n_probe, self.n_lists)
+        lists = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe].tolist()
+
+        rows = []
+        approx = []
+        for codes, scales, _, offsets, first in self._segments():
+            for l in lists:
+                start, end = int(offsets[l]), int(offsets[l + 1])
+                if end == start:
+                    continue
+                scores = np.asarray(codes[start:end], dtype=np.float32) @ query
+                if scales is not None:
+                    scores *= scales[start:end]
+                list_rows = np.arange(first + start, first + end)
+                if first == 0 and self.n_removed:
+                    alive = self.alive[start:end]
+                    scores, list_rows = scores[alive], list_rows[alive]
+                rows.append(list_rows)
+                approx.append(scores)
+        if not rows:
+            return []
+        rows = np.concatenate(rows)
+        approx = np.concatenate(approx)
+
+        if len(rows) > rerank:
+            keep = np.argpartition(-approx, rerank - 1)[:rerank]
+            rows = np.sort(rows[keep])
+        exact = self.vectors(rows) @ query
+
+        results = [(self.key(row), float(score)) for row, score in zip(rows.tolist(), exact.tolist())]
+        results.sort(key=lambda item: (-item[1], item[0]))
+        return results[:k]
+
+    def save(self, path):
+        """Write the index as a directory of .npy files plus meta.json.
+
+        The trained rows are only written when `path` does not already
+        hold them (the index was not loaded from or last saved to it).
+        """
+        os.makedirs(path, exist_ok=True)
+        arrays = {}
+        if self._saved_to != os.path.abspath(path):
+            key_offsets, key_bytes = _encode_keys(self.keys)
+            arrays.update(centroids=self.centroids, list_offsets=self.list_offsets, codes=self.codes,
+                          scales=self.scales, exact=self.exact, key_offsets=key_offsets, key_bytes=key_bytes)
+        added_key_offsets, added_key_bytes = _encode_keys(self.added_keys)
+        arrays.update(added_offsets=self.added_offsets, added_codes=self.added_codes,
+                      added_scales=self.added_scales, added_exact=self.added_exact,
+                      added_key_offsets=added_key_offsets, added_key_bytes=added_key_bytes,
+                      removed=np.flatnonzero(~self.alive))
+
+        for name, array in arrays.items():
+            file_path = os.path.join(path, name + '.npy')
+            if array is None:
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                continue
+            # Replace rather than overwrite, so a loaded index keeps its memory maps valid
+            tmp_path = os.path.join(path, name + '.tmp.npy')
+            np.save(tmp_path, np.asarray(array))
+            os.replace(tmp_path, file_path)
+
+        meta = {'format_version': INDEX_FORMAT_VERSION, 'precision': self.precision, 'count': len(self),
+                'trained': len(self.keys), 'dim': int(self.dim), 'n_lists': int(self.n_lists),
+                'exact': self.exact is not None, 'model_id': self.model_id}
+        tmp_path = os.path.join(path, 'meta.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        # meta.json goes last, so a half-written index is never loaded
+        os.replace(tmp_path, os.path.join(path, 'meta.json'))
+        self._saved_to = os.path.abspath(path)
+
+    @classmethod
+    def load(cls, path):
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        # Format 1 had no added rows, tombstones or model ID
+        if meta['format_version'] not in (1, INDEX_FORMAT_VERSION):
+            raise ValueError(f"Unsupported vector index format in {path}")
+
+        def array(name, mmap=True):
+            file_path = os.path.join(path, name + '.npy')
+            if not os.path.exists(file_path):
+                return None
+            return np.load(file_path, mmap_mode='r' if mmap else None)
+
+        keys = _decode_keys(array('key_offsets', mmap=False), array('key_bytes', mmap=False))
+        index = cls(keys, array('centroids', mmap=False), array('list_offsets', mmap=False),
+                    array('codes'), array('scales', mmap=False), array('exact'), meta['precision'],
+                    meta.get('model_id'))
+
+        removed = array('removed', mmap=False)
+        if removed is not None and len(removed):
+            index.alive[removed] = False
+            index.n_removed = len(removed)
+        added_offsets = array('added_offsets', mmap=False)
+        if added_offsets is not None:
+            index._set_added(_decode_keys(array('added_key_offsets', mmap=False),
+                                          array('added_key_bytes', mmap=False)),
+                             added_offsets, array('added_codes'), array('added_scales', mmap=False),
+                             array('added_exact'))
+        index._saved_to = os.path.abspath(path)
+        return index
+
+    @classmethod
+    def open(cls, path, model_id):
+        """Load the index at `path` if it holds vectors from `model_id`.
+
+        Returns None when there is no index, or when it was built from
+        another embedding model (its vectors are not comparable with new
+        ones); the caller then rebuilds it from its records.
+        """
+        if not os.path.exists(os.path.join(path, 'meta.json')):
+            return None
+        index = cls.load(path)
+        if index.model_id == model_id:
+            return index
+        print(f"Vector index {path} was built with a different embedding model; rebuilding it")
+        return None
+
+
+def update_vector_index(index, keys, vectors, removed=(), retrain=False, **build_options):
+    """Add or replace `keys` in `index` and drop `removed`; builds a new index when `index` is None.
+
+    New vectors are assigned to the existing lists. The lists are only
+    retrained, from every stored vector, when `retrain` is set, when the
+    precision changes or once `drift` passes RETRAIN_DRIFT.
+    """
+    if index is None:
+        return VectorIndex.build(list(keys), vectors, **build_options)
+    model_id = build_options.pop('model_id', index.model_id)
+    if model_id != index.model_id:
+        raise ValueError("Cannot mix vectors from different embedding models in one index")
+
+    index.remove(removed)
+    index.add(keys, vectors)
+    build_options.setdefault('keep_exact', index.exact is not None)
+    precision = build_options.setdefault('precision', index.precision)
+    if len(index) and (retrain or precision != index.precision or index.drift > RETRAIN_DRIFT):
+        rows = index.live_rows()
+        return VectorIndex.build([index.key(row) for row in rows.tolist()], index.vectors(rows),
+                                 model_id=model_id, **build_options)
+    return index
+
+
+if __name__ == "__main__":
+    # Query an index built by main.py --semantic --vector-index
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python vector_index.py <index dir> <jd.txt> [n_probe]")
+        sys.exit(1)
+
+    from semantic import SemanticEncoder
+    from text_decoding import read_text
+
+    index = VectorIndex.load(sys.argv[1])
+    encoder = SemanticEncoder()
+    if index.model_id != encoder.model_id:
+        print(f"{sys.argv[1]} was built with a different embedding model; rebuild it with main.py --vector-index")
+        sys.exit(1)
+    query = encoder.embed_documents([read_text(sys.argv[2])])[0]
+
+    n_probe = int(sys.argv[3]) if len(sys.argv) == 4 else 8
+    print(f"{len(index)} indexed resumes, {index.n_lists} lists, {index.precision}")
+    for key, score in index.search(query, k=20, n_probe=n_probe):
+        print(f"{score * 100:6.2f}%  {key}")